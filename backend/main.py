@@ -1,34 +1,63 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File
 from pydantic import BaseModel
-from typing import List
+from typing import AsyncIterator, List, Optional
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from services.interview_service import InterviewService
-from services.audio_service import AudioService
+from services.audio_service import AudioService, MAX_AUDIO_BYTES
 from services.pdf_service import PDFService
+from services.semantic_cache import SemanticCache
 import os
+import sys
+import queue
+import logging
+import logging.handlers
+import asyncio
+import base64
+import httpx
+import orjson
 from pathlib import Path
+from urllib.parse import quote
 
 
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 origins = [os.getenv("FRONTEND_URL", "http://localhost:3000")]
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Response-Text"],
 )
 
-interview_service = InterviewService()
+semantic_cache = None
+if os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true":
+    semantic_cache = SemanticCache(cache_path=os.getenv("SEMANTIC_CACHE_PATH"))
+
+# Created on startup, in the process that serves requests (see start_background_resources)
+log_listener: Optional[logging.handlers.QueueListener] = None
+shared_http_client: Optional[httpx.AsyncClient] = None
+
+interview_service = InterviewService(semantic_cache=semantic_cache)
 audio_service = AudioService()
 pdf_service = PDFService()
 
+async def iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    """
+    Read an upload in fixed-size chunks instead of all at once.
+    """
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
 class InterviewContext(BaseModel):
     resume_text: str
     job_description: str
@@ -36,6 +65,46 @@ class InterviewContext(BaseModel):
     messages: List[dict]
     difficulty: str = "medium"
 
+@app.on_event("startup")
+def start_background_resources():
+    """
+    Start the log listener thread and the pooled HTTP client.
+    Done here rather than at import, because uvicorn.run("main:app") from __main__ imports
+    this module again in its parent process, which never runs the shutdown hook.
+    """
+    global log_listener, shared_http_client
+    
+    # Handlers only enqueue records; a background thread does the blocking stream writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+    log_listener.start()
+    
+    # One pooled HTTP/2 client for all Groq calls so connections (and TLS sessions) are reused
+    shared_http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    interview_service.http_client = shared_http_client
+
+@app.on_event("shutdown")
+async def release_background_resources():
+    """
+    Write the semantic cache to disk so it survives restarts, close pooled upstream
+    connections, then flush queued log records. The log listener stops last so anything
+    logged by the earlier steps is still written.
+    """
+    if semantic_cache:
+        semantic_cache.save()
+    if shared_http_client:
+        await shared_http_client.aclose()
+    if log_listener:
+        log_listener.stop()
+
 @app.get("/health")
 async def health_check():
     """
@@ -49,35 +118,93 @@ async def health_check():
     }
 
 @app.post("/chat")
-async def chat_endpoint(context: InterviewContext):
+async def chat_endpoint(context: InterviewContext, request: Request):
     """
     Main chat endpoint for the AI interviewer.
     Generates interview questions and responses with audio.
+    Clients that send an audio/* Accept header get the raw audio as the body (with the
+    reply text URL-encoded in X-Response-Text) instead of base64 inside JSON.
     """
     try:
-        response_text, audio_data = interview_service.process_interview_turn(
+        response_text, audio_data = await interview_service.process_interview_turn(
+            resume_text=context.resume_text,
+            job_description=context.job_description,
+            candidate_name=context.candidate_name,
+            messages=context.messages,
+            difficulty=context.difficulty
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if audio_data is not None and "audio/" in request.headers.get("accept", ""):
+        return Response(
+            content=audio_data,
+            media_type="audio/mpeg",
+            headers={"X-Response-Text": quote(response_text)}
+        )
+    
+    return {
+        "response": response_text,
+        "audio": base64.b64encode(audio_data).decode("utf-8") if audio_data is not None else None
+    }
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(context: InterviewContext):
+    """
+    Streaming variant of /chat.
+    The reply text is sent URL-encoded in the X-Response-Text header and the body is raw
+    MP3 audio, written sentence by sentence as it is synthesized.
+    """
+    try:
+        response_text, audio_stream = await interview_service.stream_interview_turn(
             resume_text=context.resume_text,
             job_description=context.job_description,
             candidate_name=context.candidate_name,
             messages=context.messages,
             difficulty=context.difficulty
         )
-        
-        return {
-            "response": response_text,
-            "audio": audio_data
-        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        audio_stream,
+        media_type="audio/mpeg",
+        headers={"X-Response-Text": quote(response_text)}
+    )
+
+@app.post("/chat/events")
+async def chat_events_endpoint(context: InterviewContext):
+    """
+    Server-sent events variant of /chat.
+    Emits a "sentence" event (text + base64 MP3) as soon as each sentence is synthesized,
+    then a "done" event with the full reply, or an "error" event if generation fails.
+    """
+    async def event_stream():
+        try:
+            async for event in interview_service.stream_interview_events(
+                resume_text=context.resume_text,
+                job_description=context.job_description,
+                candidate_name=context.candidate_name,
+                messages=context.messages,
+                difficulty=context.difficulty
+            ):
+                yield b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"type": "error", "detail": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 @app.post("/transcribe")
 async def transcribe_audio(file: UploadFile = File(...)):
     """
     Transcribe audio to text using Deepgram STT.
     """
+    # The multipart body is already spooled, so an oversized upload is refused before anything is sent
+    if file.size is not None and file.size > MAX_AUDIO_BYTES:
+        raise HTTPException(status_code=400, detail="Audio file is too large")
+    
     try:
-        audio_data = await file.read()
-        transcript = audio_service.transcribe_audio(audio_data)
+        transcript = await audio_service.transcribe_stream(iter_upload(file))
         return {"transcript": transcript}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -88,15 +215,41 @@ async def transcribe_audio(file: UploadFile = File(...)):
 @app.post("/process-pdf")
 async def process_pdf(file: UploadFile = File(...)):
     """
-    Process a PDF file and extract text.
+    Process a resume PDF and extract text.
+    Long resumes come back condensed in "text", with the extracted text in "full_text".
     """
+    if not pdf_service.is_pdf(file.file):
+        raise HTTPException(status_code=400, detail="Uploaded file is not a PDF")
+    
     try:
-        content = await file.read()
-        text = pdf_service.process_pdf(content)
-        return {"text": text}
+        # pypdf reads the spooled upload directly; parsing is blocking, so keep it off the loop
+        text = await asyncio.to_thread(pdf_service.process_pdf, file.file)
+        return {"text": await interview_service.condense_resume(text), "full_text": text}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-       
+
+@app.post("/process-pdfs")
+async def process_pdfs(resume: UploadFile = File(...), jd: UploadFile = File(...)):
+    """
+    Process a resume PDF and a job description PDF in parallel and extract both texts.
+    Long resumes come back condensed in "resume_text", with the extracted text in "full_resume_text".
+    """
+    if not (pdf_service.is_pdf(resume.file) and pdf_service.is_pdf(jd.file)):
+        raise HTTPException(status_code=400, detail="Uploaded file is not a PDF")
+    
+    try:
+        resume_text, jd_text = await asyncio.gather(
+            asyncio.to_thread(pdf_service.process_pdf, resume.file),
+            asyncio.to_thread(pdf_service.process_pdf, jd.file),
+        )
+        return {
+            "resume_text": await interview_service.condense_resume(resume_text),
+            "full_resume_text": resume_text,
+            "job_description": jd_text
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 @app.post("/feedback")
 async def feedback_endpoint(context: InterviewContext):
@@ -104,12 +257,58 @@ async def feedback_endpoint(context: InterviewContext):
     Generate feedback based on the interview conversation.
     """
     try:
-        feedback = interview_service.generate_feedback(context.messages)
+        feedback = await interview_service.generate_feedback(context.messages)
         return feedback
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/feedback/stream")
+async def feedback_stream_endpoint(context: InterviewContext):
+    """
+    Server-sent events variant of /feedback.
+    Emits a "field" event as each feedback key (rating, feedback, improvements) is complete,
+    then a "done" event with the whole object, or an "error" event if generation fails.
+    """
+    async def event_stream():
+        try:
+            async for event in interview_service.generate_feedback_stream(context.messages):
+                yield b"event: " + event["type"].encode() + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + orjson.dumps({"type": "error", "detail": str(e)}) + b"\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/feedback/batch")
+async def feedback_batch_endpoint(context: InterviewContext):
+    """
+    Queue feedback on Groq's discounted Batch API instead of the real-time endpoint.
+    Returns a batch_id to poll via GET /feedback/batch/{batch_id}.
+    """
+    try:
+        return await interview_service.submit_feedback_batch(context.messages)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/feedback/batch/{batch_id}")
+async def feedback_batch_status_endpoint(batch_id: str):
+    """
+    Get the status of a queued feedback batch, including the feedback once completed.
+    """
+    try:
+        return await interview_service.get_feedback_batch(batch_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
     
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop has no Windows build, so fall back to the stock asyncio loop there
+    # Workers are separate processes, so uvicorn needs the import string rather than the app object
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", min(4, os.cpu_count() or 1))),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
 
@@ -5,5 +5,7 @@ Services package for the AI Interviewer backend.
 from .interview_service import InterviewService
 from .audio_service import AudioService
 from .pdf_service import PDFService
+from .semantic_cache import SemanticCache
+from .completion_batcher import CompletionBatcher
 
-__all__ = ["InterviewService", "AudioService", "PDFService"]
+__all__ = ["InterviewService", "AudioService", "PDFService", "SemanticCache", "CompletionBatcher"]
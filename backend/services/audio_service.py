@@ -4,8 +4,42 @@ Handles speech-to-text (STT) using Deepgram.
 """
 
 import os
-from deepgram import DeepgramClient, PrerecordedOptions, FileSource
-from typing import Optional
+import logging
+import functools
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from .clients import get_deepgram_client
+
+if TYPE_CHECKING:
+    from deepgram import FileSource
+
+
+logger = logging.getLogger(__name__)
+
+
+# Largest upload forwarded to Deepgram; anything bigger is rejected before the outbound call
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+# Leading bytes of the containers browsers and common recorders produce
+AUDIO_SIGNATURES = (
+    b"RIFF",              # WAV
+    b"OggS",              # Ogg / Opus
+    b"\x1aE\xdf\xa3",      # WebM / Matroska
+    b"fLaC",              # FLAC
+    b"ID3",               # MP3 with ID3 tag
+)
+
+
+def looks_like_audio(header: bytes) -> bool:
+    """
+    Cheap magic-number check on the first bytes of an upload.
+    """
+    if header.startswith(AUDIO_SIGNATURES):
+        return True
+    # MP4 / M4A (Safari's MediaRecorder) carries "ftyp" after the box size
+    if header[4:8] == b"ftyp":
+        return True
+    # Bare MPEG audio frame sync
+    return len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0
 
 
 class AudioService:
@@ -15,29 +49,67 @@ class AudioService:
 
         if not self.api_key:
             raise ValueError("DEEPGRAM_API_KEY not found in environment")
-        
-        self.client = DeepgramClient(api_key=self.api_key)
     
-    def transcribe_audio(self, audio_data: bytes) -> str:
+    # The Deepgram SDK is slow to import, so the shared client is fetched on first use
+    @functools.cached_property
+    def client(self):
+        return get_deepgram_client(self.api_key)
+    
+    async def transcribe_audio(self, audio_data: bytes) -> str:
         if not audio_data or len(audio_data) == 0:
             raise ValueError("Empty audio file provided")
+        if len(audio_data) > MAX_AUDIO_BYTES:
+            raise ValueError("Audio file is too large")
+        if not looks_like_audio(audio_data[:16]):
+            raise ValueError("Unsupported audio format")
+        
+        payload: "FileSource" = {
+            "buffer": audio_data,
+        }
+        return await self._transcribe(payload)
+    
+    async def transcribe_stream(self, audio_chunks: AsyncIterator[bytes]) -> str:
+        """
+        Transcribe audio supplied as chunks, forwarding them to Deepgram as a chunked
+        request body instead of joining them into one buffer first.
+        """
+        first_chunk = await anext(audio_chunks, b"")
+        if not first_chunk:
+            raise ValueError("Empty audio file provided")
+        if not looks_like_audio(first_chunk[:16]):
+            raise ValueError("Unsupported audio format")
+        
+        async def body() -> AsyncIterator[bytes]:
+            total = len(first_chunk)
+            yield first_chunk
+            async for chunk in audio_chunks:
+                total += len(chunk)
+                if total > MAX_AUDIO_BYTES:
+                    raise ValueError("Audio file is too large")
+                yield chunk
+        
+        payload: "FileSource" = {
+            "stream": body(),
+        }
+        return await self._transcribe(payload)
+    
+    async def _transcribe(self, payload: "FileSource") -> str:
+        from deepgram import PrerecordedOptions
         
         try:
-            payload: FileSource = {
-                "buffer": audio_data,
-            }
-            
             options = PrerecordedOptions(
                 model="nova-2",
                 smart_format=True,
             )
             
-            # Correct v3 syntax for file upload
-            response = self.client.listen.prerecorded.v("1").transcribe_file(payload, options)
+            # Async v3 client so the event loop keeps serving other requests during STT
+            response = await self.client.listen.asyncprerecorded.v("1").transcribe_file(payload, options)
             
             transcript = response.results.channels[0].alternatives[0].transcript
             return transcript
             
+        except ValueError:
+            raise
         except Exception as e:
-            print(f"ERROR in transcription: {str(e)}")
+            logger.error("ERROR in transcription: %s", e)
             raise Exception(f"Transcription failed: {str(e)}")
@@ -0,0 +1,36 @@
+"""
+Shared API Clients
+Process-wide Groq and Deepgram clients, so every service instance reuses the same
+connection pool instead of opening its own.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+
+_clients: Dict[Tuple, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_client(factory: Callable[..., Any], **settings) -> Any:
+    """
+    Build one client per (factory, settings) and hand the same instance to every caller.
+    """
+    key = (factory, tuple(sorted(settings.items())))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory(**settings)
+    return client
+
+
+def get_groq_client(api_key: str, http_client: Optional[httpx.AsyncClient] = None) -> Any:
+    from groq import AsyncGroq
+    return _shared_client(AsyncGroq, api_key=api_key, http_client=http_client)
+
+
+def get_deepgram_client(api_key: str) -> Any:
+    from deepgram import DeepgramClient
+    return _shared_client(DeepgramClient, api_key=api_key)
@@ -0,0 +1,107 @@
+"""
+Completion Batcher
+Groups concurrent Groq chat completion calls into short bursts on a shared client.
+"""
+
+import asyncio
+import inspect
+from typing import Any, List, Optional, Set, Tuple
+
+
+PendingRequest = Tuple[dict, asyncio.Future]
+
+
+class CompletionBatcher:
+    """
+    Adaptive micro-batcher in the style of MLServer's AdaptiveBatcher.
+
+    Requests are queued; a background worker collects up to `batch_size` of them, waiting at
+    most `batch_timeout` seconds after the first one arrives, then fires the whole batch at
+    once with asyncio.gather so the calls share the client's pooled connections. A request
+    that arrives alone (nothing else queued behind it) is dispatched immediately, so the
+    timeout only adds latency while a burst is already under way. Each caller awaits its
+    own future and gets back exactly what `chat.completions.create` returned (a completion,
+    or a stream when `stream=True`).
+    """
+
+    def __init__(self, client: Any, batch_size: int = 8, batch_timeout: float = 0.05):
+        self.client = client
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # The loop only holds weak references to tasks, so in-flight dispatches are kept here
+        self._inflight: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, **kwargs) -> Any:
+        """
+        Queue a `chat.completions.create(**kwargs)` call and wait for its result.
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((kwargs, future))
+        return await future
+
+    async def _collect_batch(self) -> List[PendingRequest]:
+        batch = [await self._queue.get()]
+        if self._queue.empty():
+            return batch
+        deadline = self._loop.time() + self.batch_timeout
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            task = self._loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[PendingRequest]) -> None:
+        results = await asyncio.gather(
+            *(self.client.chat.completions.create(**kwargs) for kwargs, _ in batch),
+            return_exceptions=True
+        )
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The caller was cancelled; an unclaimed stream would hold its pooled connection
+                await self._discard(result)
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @staticmethod
+    async def _discard(result: Any) -> None:
+        """
+        Close a result nobody will read, such as a groq AsyncStream. Close errors are ignored.
+        """
+        close = getattr(result, "close", None)
+        if isinstance(result, BaseException) or not callable(close):
+            return
+        try:
+            closing = close()
+            if inspect.isawaitable(closing):
+                await closing
+        except Exception:
+            pass
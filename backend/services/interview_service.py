@@ -4,18 +4,423 @@ Handles AI interview logic including prompt generation, Groq API calls, and TTS.
 """
 
 import os
-import uuid
+import logging
+import functools
+import itertools
+import hashlib
 import base64
-import json
 import re
-from typing import List, Dict, Optional, Tuple
-from groq import Groq
-from deepgram import DeepgramClient
+import json
+import asyncio
+from collections import OrderedDict
+import httpx
+import orjson
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, List, Dict, Mapping, Optional, Tuple
+from .semantic_cache import SemanticCache
+from .completion_batcher import CompletionBatcher
+from .clients import get_groq_client, get_deepgram_client
+
+
+logger = logging.getLogger(__name__)
+
+
+# Splits streamed LLM output after sentence-ending punctuation
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Maximum number of synthesized sentences kept in memory
+TTS_CACHE_SIZE = 512
+
+# Deepgram voice for short text, where model latency dominates, and for longer text,
+# where throughput does; both are the Asteria voice so the interviewer sounds the same
+TTS_MODEL_SHORT = "aura-asteria-en"
+TTS_MODEL_LONG = "aura-2-asteria-en"
+TTS_SHORT_TEXT_CHARS = 200
+
+# Streamed replies are voiced sentence by sentence, so their length is estimated from the
+# opening sentence; one this long usually starts a multi-sentence answer
+TTS_LONG_OPENING_CHARS = 100
+
+# Maximum number of exact-match interviewer replies kept in memory
+RESPONSE_CACHE_SIZE = 128
+
+# Number of most recent messages sent verbatim to Groq on each turn
+HISTORY_WINDOW = 10
+
+# Resumes longer than this are condensed before they are embedded in the system prompt
+RESUME_CHAR_LIMIT = 6000
+
+# Target length of a condensed resume
+RESUME_SUMMARY_CHARS = 1500
+
+# Interview phase indexed by the number of assistant turns so far; anything later is WRAP_UP
+_PHASE_BY_ASSISTANT_COUNT = (
+    "INTRODUCTION", "INTRODUCTION",
+    "TECHNICAL", "TECHNICAL", "TECHNICAL",
+    "BEHAVIORAL", "BEHAVIORAL", "BEHAVIORAL",
+)
+
+# Each feedback batch holds a single interview, identified by this line id
+FEEDBACK_BATCH_CUSTOM_ID = "feedback"
+
+# Live feedback calls in flight at once when a multi-session batch falls back
+FEEDBACK_FALLBACK_CONCURRENCY = 4
+
+
+_DIFFICULTY_INSTRUCTIONS: Mapping[str, str] = MappingProxyType({
+    "easy": """
+        **EASY MODE - Foundational & Encouraging**
+        - Focus on DEFINITIONS and BASIC CONCEPTS (e.g., "What is a class?", "What is an API?")
+        - Ask about HIGH-LEVEL understanding without deep implementation details
+        - Include SOFT SKILLS questions (teamwork, communication, work style)
+        - Be ENCOURAGING and supportive in your responses
+        - Examples: "What does OOP mean?", "How do you handle feedback?", "Tell me about a time you worked in a team"
+        - Avoid: System design, optimization, trade-offs, complex algorithms
+        """,
+    "medium": """
+        **MEDIUM MODE - Implementation & Practical Experience**
+        - Focus on IMPLEMENTATION DETAILS and real-world scenarios
+        - Ask about STANDARD PATTERNS and best practices (e.g., "How do you handle API errors?", "Explain your approach to testing")
+        - Explore TRADE-OFFS between different solutions
+        - Ask for CONCRETE EXAMPLES from past experience
+        - Examples: "How would you structure a REST API?", "What's your debugging process?", "Explain async/await"
+        - Balance: Some theory, mostly practical application
+        """,
+    "hard": """
+        **HARD MODE - System Design & Deep Expertise**
+        - Focus on SYSTEM DESIGN and SCALABILITY (e.g., "How would you scale this for 1M users?")
+        - Ask about EDGE CASES, failure scenarios, and performance bottlenecks
+        - Explore OPTIMIZATION strategies (time/space complexity, caching, sharding)
+        - CHALLENGE ASSUMPTIONS - make them defend their architectural decisions
+        - Examples: "Design a URL shortener at scale", "How would you handle eventual consistency?", "Optimize this for 10k requests/sec"
+        - Expect: Deep technical knowledge, real production experience, trade-off analysis
+        """
+})
+
+# Pronunciation dictionary for TTS, applied in order (the first matching entry wins)
+_SPEECH_REPLACEMENTS: Tuple[Tuple[str, str], ...] = (
+    # Acronyms (Force letter-by-letter)
+    (r"\bAWS\b", "A. W. S."),
+    (r"\bSQL\b", "Sequel"),
+    (r"\bAPI\b", "A. P. I."),
+    (r"\bCEO\b", "C. E. O."),
+    (r"\bCTO\b", "C. T. O."),
+    (r"\bUI\b", "U. I."),
+    (r"\bUX\b", "U. X."),
+    (r"\bURL\b", "U. R. L."),
+    (r"\bSaaS\b", "Sass"),
+    (r"\bCI/CD\b", "C. I. C. D."),
+    (r"\bJWT\b", "J. W. T."),
+    
+    # Tech Jargon
+    (r"\bKubernetes\b", "Koo-ber-net-ees"),
+    (r"\bgRPC\b", "G. R. P. C."),
+    (r"\bJSON\b", "Jay-sawn"),
+    
+    # Homographs
+    (r"\bresume\b", "reh-zoo-may"),
+    (r"\bResume\b", "Reh-zoo-may"),
+    (r"\blive\b", "lye-v"),  # As in "live server"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_speech_pattern(
+    name: Optional[str] = None,
+    name_pronunciation: Optional[str] = None
+) -> Tuple["re.Pattern[str]", Tuple[str, ...]]:
+    """
+    Fold the pronunciation dictionary (plus an optional candidate-name entry) into one
+    alternation so sanitizing is a single pass over the text. Each entry gets its own
+    group; match.lastindex - 1 indexes the returned replacements.
+    Keyed on the raw name, so escaping and compiling happen once per name.
+    """
+    entries = _SPEECH_REPLACEMENTS
+    if name and name_pronunciation:
+        entries += ((fr"\b{re.escape(name)}\b", name_pronunciation),)
+    pattern = re.compile("|".join(f"({regex})" for regex, _ in entries), re.IGNORECASE)
+    return pattern, tuple(replacement for _, replacement in entries)
+
+
+# Per-phase instructions; {candidate_name} is filled in with str.format
+_PHASE_INSTRUCTIONS: Mapping[str, str] = MappingProxyType({
+    "INTRODUCTION": """
+        **CURRENT PHASE: INTRODUCTION**
+
+        **YOUR IMMEDIATE GOAL:**
+        - Warmly welcome {candidate_name} to the interview
+        - Keep it BRIEF (1-2 sentences max)
+        - Ask them to introduce themselves and briefly describe their background
+        - DO NOT ask technical questions yet - save those for the next phase
+
+        **Example Response:**
+        "Hi {candidate_name}, thanks for joining me today. Could you tell me a bit about yourself and your background?"
+
+        **CONSTRAINTS:**
+        - Keep your response under 2 sentences
+        - Focus ONLY on getting their introduction
+        - Be warm but professional
+        """,
+    "TECHNICAL": """
+        **CURRENT PHASE: TECHNICAL DEEP DIVE**
+
+        **YOUR IMMEDIATE GOAL:**
+        - Pick ONE specific skill from their resume (e.g., Python, React, AWS, etc.)
+        - Ask a HARD, SPECIFIC technical question about that skill
+        - Do NOT accept vague answers - probe for details
+        - Focus on implementation, not just theory
+
+        **What to Cover:**
+        - Architecture decisions
+        - Code quality and best practices  
+        - Problem-solving approach
+        - Real-world experience with the technology
+
+        **Example Questions:**
+        - "I see you used React - how do you handle state management in large applications?"
+        - "You mentioned Python - explain your approach to async programming and when you'd use it"
+        - "Tell me about a time you had to optimize database queries. What was your approach?"
+
+        **CONSTRAINTS:**
+        - ONE question at a time
+        - Make it specific to their resume
+        - Challenge weak or vague answers
+        - Stay in technical territory - NO behavioral questions yet
+        """,
+    "BEHAVIORAL": """
+        **CURRENT PHASE: BEHAVIORAL & SOFT SKILLS**
+
+        **YOUR IMMEDIATE GOAL:**
+        - Shift from technical to behavioral questions
+        - Assess team fit, communication, and work style
+        - Focus on real situations and examples
+
+        **What to Cover:**
+        - Teamwork and collaboration
+        - Handling conflict or pressure
+        - Communication with non-technical stakeholders
+        - Learning from failures
+        - Leadership or mentorship
+
+        **Example Questions:**
+        - "Tell me about a time you disagreed with a team member. How did you handle it?"
+        - "Describe a situation where you had to explain a complex technical concept to a non-technical person"
+        - "What's a project that didn't go as planned? What did you learn?"
+
+        **CONSTRAINTS:**
+        - ONE question at a time
+        - Ask for SPECIFIC examples (use STAR format mentally)
+        - NO more technical questions - you're assessing personality and fit now
+        - Listen for communication skills and self-awareness
+        """,
+    "WRAP_UP": """
+        **CURRENT PHASE: CONCLUSION**
+
+        **YOUR IMMEDIATE GOAL:**
+        - Start wrapping up the interview
+        - Thank {candidate_name} for their time
+        - Ask if they have any questions for you
+        - Provide brief, positive feedback
+        - End the interview gracefully
+
+        **What to Say:**
+        1. "Thank you for your time today, {candidate_name}. You shared some great insights."
+        2. "Before we wrap up - do you have any questions for me about the role or the team?"
+        3. After their response (or if none): "Great! We'll be in touch soon. Thanks again and have a great day!"
+
+        **CONSTRAINTS:**
+        - Keep it SHORT and professional
+        - Be positive (save critical feedback for the written report)
+        - DO NOT ask more interview questions
+        - Make them feel good about the experience
+        - Signal clearly that the interview is ending
+        """
+})
+
+# Interviewer rubric. It has no per-session fields, so it is byte-identical for every request
+# and forms a prefix the provider can cache
+_INTERVIEW_RUBRIC = """
+            You are a **Senior Hiring Manager** conducting a professional technical interview for a software engineering role.
+
+            === YOUR ROLE & RESPONSIBILITIES ===
+            You are evaluating the candidate named in the session details for this position. Act professionally, analytically, and strategically.
+
+            === CRITICAL INSTRUCTIONS ===
+
+            1. **PROFESSIONAL CONDUCT**
+            - Address the candidate by name occasionally to maintain rapport
+            - Maintain a professional yet conversational tone
+            - Be respectful but evaluative - you're assessing fit for the role
+
+            2. **QUESTION STRATEGY**
+            - Ask **ONE question at a time** - never list multiple questions
+            - **NEVER repeat a question** you've already asked
+            - Review the conversation history carefully before asking
+            - If you've covered a topic, move to a different area
+
+            3. **DYNAMIC FOLLOW-UPS**
+            - **ALWAYS read the candidate's previous answer** before responding
+            - Ask relevant follow-up questions based on their specific answer
+            - If they mention a technology/project, dig deeper into it
+            - If their answer is vague, ask for concrete examples
+            - If their answer is strong, probe edge cases or advanced scenarios
+
+            4. **DIFFICULTY LEVEL**
+            - Follow the difficulty instructions given in the session details
+
+            5. **RESPONSE FORMAT**
+            - Keep responses under 3 sentences (will be spoken aloud)
+            - Start by reacting to their answer ("That's interesting...", "I see...", "Good point...")
+            - Then ask your next question naturally
+
+            6. **INTERVIEW FLOW**
+            - If this is the start, warmly ask them to introduce themselves
+            - Cover: background, technical skills, problem-solving, behavioral questions
+            - Adapt based on their resume and the job requirements
+            - Progress logically through topics - don't jump randomly
+
+            7. **EVALUATION MINDSET**
+            - You're not just asking questions - you're assessing competency
+            - Listen for: clarity, depth of knowledge, communication skills
+            - Challenge weak answers politely
+            - Acknowledge strong answers but keep probing
+
+            8. **NAME FIDELITY**
+            - The candidate's official name is the one given in the session details
+            - Speech-to-text may generate phonetic errors (e.g., 'Raheem' instead of 'Zayeem')
+            - You must ALWAYS use the official name
+            - If the transcript shows a different but similar-sounding name, assume it is a typo and ignore it
+
+            9. **NO META-TEXT**
+                - Do NOT include placeholder text like '*Awaiting response*', '[End of turn]', or any actions in asterisks
+                - Only output the spoken response content without UI cues or status markers
+
+            **Remember:** You have full conversation history. Use it to create a coherent, adaptive interview experience.
+        """
+
+# Per-session details, constant for the whole interview, filled in with str.format
+_INTERVIEW_SESSION_TEMPLATE = """
+            === JOB DESCRIPTION ===
+            {job_description}
+
+            === CANDIDATE RESUME ===
+            {resume_text}
+
+            === SESSION DETAILS ===
+            Candidate: {candidate_name}; Difficulty: {difficulty}
+            {diff_instruction}
+        """
+
+# Per-phase suffix, the only part of the prompt that changes during an interview
+_INTERVIEW_PHASE_TEMPLATE = """
+            {phase_instruction}
+
+            ⚠️ **CRITICAL:** The CURRENT PHASE instruction above takes ABSOLUTE PRIORITY. Follow it strictly to maintain interview flow.
+        """
+
+
+@functools.lru_cache(maxsize=64)
+def _build_session_context(
+    job_description: str,
+    resume_text: str,
+    candidate_name: str,
+    difficulty: str
+) -> str:
+    """
+    Render the per-session segment (job description, resume, name, difficulty).
+    Memoized separately from the phase suffix, so a phase change within a session
+    reuses the large JD + resume block instead of re-rendering it.
+    """
+    diff_instruction = _DIFFICULTY_INSTRUCTIONS.get(difficulty.lower(), _DIFFICULTY_INSTRUCTIONS["medium"])
+    
+    return _INTERVIEW_SESSION_TEMPLATE.format(
+        job_description=job_description,
+        # Resumes are condensed at upload; this only caps text that bypassed that step
+        resume_text=resume_text[:RESUME_CHAR_LIMIT],
+        candidate_name=candidate_name,
+        difficulty=difficulty.upper(),
+        diff_instruction=diff_instruction,
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_phase_suffix(candidate_name: str, phase: str) -> str:
+    phase_instruction = _PHASE_INSTRUCTIONS.get(phase, _PHASE_INSTRUCTIONS["INTRODUCTION"]).format(
+        candidate_name=candidate_name
+    )
+    return _INTERVIEW_PHASE_TEMPLATE.format(phase_instruction=phase_instruction)
+
+
+def _build_interview_prompt_segments(
+    job_description: str,
+    resume_text: str,
+    candidate_name: str,
+    difficulty: str,
+    phase: str
+) -> Tuple[str, str, str]:
+    """
+    Return the interviewer system prompt as (rubric, session context, phase suffix),
+    ordered from most to least stable so the shared prefix stays byte-identical.
+    """
+    return (
+        _INTERVIEW_RUBRIC,
+        _build_session_context(job_description, resume_text, candidate_name, difficulty),
+        _build_phase_suffix(candidate_name, phase),
+    )
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _closed_json_fields(buffer: str, position: int) -> Tuple[List[Tuple[str, Any]], int]:
+    """
+    Incrementally parse the top-level "key": value pairs of a JSON object that is still
+    being streamed. `position` points just past the opening brace or the last parsed field.
+    Returns the fields that are complete in `buffer` and the position to resume from.
+    A value only counts as complete once the next delimiter has arrived, so a number
+    like 8 is not emitted before it could still become 85.
+    """
+    fields = []
+    length = len(buffer)
+    
+    while True:
+        index = position
+        while index < length and buffer[index] in " \t\r\n,":
+            index += 1
+        if index >= length or buffer[index] == "}":
+            return fields, position
+        
+        try:
+            key, index = _JSON_DECODER.raw_decode(buffer, index)
+            while index < length and buffer[index].isspace():
+                index += 1
+            if index >= length or buffer[index] != ":":
+                return fields, position
+            index += 1
+            while index < length and buffer[index].isspace():
+                index += 1
+            value, index = _JSON_DECODER.raw_decode(buffer, index)
+        except json.JSONDecodeError:
+            return fields, position
+        
+        while index < length and buffer[index].isspace():
+            index += 1
+        if index >= length:
+            return fields, position
+        
+        fields.append((key, value))
+        position = index
 
 
 class InterviewService:
     
-    def __init__(self, groq_api_key: Optional[str] = None, deepgram_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        groq_api_key: Optional[str] = None,
+        deepgram_api_key: Optional[str] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
 
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
         self.deepgram_api_key = deepgram_api_key or os.getenv("DEEPGRAM_API_KEY")
@@ -25,21 +430,49 @@ class InterviewService:
         if not self.deepgram_api_key:
             raise ValueError("DEEPGRAM_API_KEY not found in environment")
         
-        self.groq_client = Groq(api_key=self.groq_api_key)
-        self.deepgram_client = DeepgramClient(api_key=self.deepgram_api_key)
+        self.http_client = http_client
+        self.semantic_cache = semantic_cache
+        self._tts_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._response_cache: "OrderedDict[bytes, Tuple[str, Optional[bytes]]]" = OrderedDict()
         self.candidate_name = None
     
-    def determine_phase(self, messages: List[Dict[str, str]]) -> str:
-        assistant_count = sum(1 for msg in messages if msg.get("role") == "assistant")
+    # The Groq and Deepgram SDKs are slow to import, so the shared clients are fetched on first use
+    @functools.cached_property
+    def groq_client(self):
+        return get_groq_client(self.groq_api_key, self.http_client)
+    
+    @functools.cached_property
+    def deepgram_client(self):
+        return get_deepgram_client(self.deepgram_api_key)
+    
+    # Chat is latency-sensitive, so it waits far less for a batch to fill than feedback
+    @functools.cached_property
+    def chat_batcher(self) -> CompletionBatcher:
+        return CompletionBatcher(self.groq_client, batch_timeout=0.01)
+    
+    @functools.cached_property
+    def feedback_batcher(self) -> CompletionBatcher:
+        return CompletionBatcher(self.groq_client, batch_timeout=0.05)
+    
+    def determine_phase(
+        self,
+        messages: List[Dict[str, str]],
+        assistant_count: Optional[int] = None
+    ) -> str:
+        """
+        Map the number of interviewer turns so far to a phase. Callers that already track
+        the count can pass it to skip rescanning the history.
+        """
+        if assistant_count is None:
+            assistant_count = self._count_assistant_turns(messages)
         
-        if assistant_count <= 1:
-            return "INTRODUCTION"
-        elif assistant_count <= 4:
-            return "TECHNICAL"
-        elif assistant_count <= 7:
-            return "BEHAVIORAL"
-        else:
-            return "WRAP_UP"
+        if assistant_count < len(_PHASE_BY_ASSISTANT_COUNT):
+            return _PHASE_BY_ASSISTANT_COUNT[assistant_count]
+        return "WRAP_UP"
+    
+    @staticmethod
+    def _count_assistant_turns(messages: List[Dict[str, str]]) -> int:
+        return sum(msg.get("role") == "assistant" for msg in messages)
     
     def build_interview_system_prompt(
         self, 
@@ -49,237 +482,175 @@ class InterviewService:
         difficulty: str = "medium",
         phase: str = "INTRODUCTION"
     ) -> str:
-
-        
-        difficulty_instructions = {
-            "easy": """
-                **EASY MODE - Foundational & Encouraging**
-                - Focus on DEFINITIONS and BASIC CONCEPTS (e.g., "What is a class?", "What is an API?")
-                - Ask about HIGH-LEVEL understanding without deep implementation details
-                - Include SOFT SKILLS questions (teamwork, communication, work style)
-                - Be ENCOURAGING and supportive in your responses
-                - Examples: "What does OOP mean?", "How do you handle feedback?", "Tell me about a time you worked in a team"
-                - Avoid: System design, optimization, trade-offs, complex algorithms
-                """,
-            "medium": """
-                **MEDIUM MODE - Implementation & Practical Experience**
-                - Focus on IMPLEMENTATION DETAILS and real-world scenarios
-                - Ask about STANDARD PATTERNS and best practices (e.g., "How do you handle API errors?", "Explain your approach to testing")
-                - Explore TRADE-OFFS between different solutions
-                - Ask for CONCRETE EXAMPLES from past experience
-                - Examples: "How would you structure a REST API?", "What's your debugging process?", "Explain async/await"
-                - Balance: Some theory, mostly practical application
-                """,
-            "hard": """
-                **HARD MODE - System Design & Deep Expertise**
-                - Focus on SYSTEM DESIGN and SCALABILITY (e.g., "How would you scale this for 1M users?")
-                - Ask about EDGE CASES, failure scenarios, and performance bottlenecks
-                - Explore OPTIMIZATION strategies (time/space complexity, caching, sharding)
-                - CHALLENGE ASSUMPTIONS - make them defend their architectural decisions
-                - Examples: "Design a URL shortener at scale", "How would you handle eventual consistency?", "Optimize this for 10k requests/sec"
-                - Expect: Deep technical knowledge, real production experience, trade-off analysis
-                """
-        }
-        
-        diff_instruction = difficulty_instructions.get(difficulty.lower(), difficulty_instructions["medium"])
-        
-        phase_instructions = {
-            "INTRODUCTION": """
-                **CURRENT PHASE: INTRODUCTION**
-
-                **YOUR IMMEDIATE GOAL:**
-                - Warmly welcome {candidate_name} to the interview
-                - Keep it BRIEF (1-2 sentences max)
-                - Ask them to introduce themselves and briefly describe their background
-                - DO NOT ask technical questions yet - save those for the next phase
-
-                **Example Response:**
-                "Hi {candidate_name}, thanks for joining me today. Could you tell me a bit about yourself and your background?"
-
-                **CONSTRAINTS:**
-                - Keep your response under 2 sentences
-                - Focus ONLY on getting their introduction
-                - Be warm but professional
-                """,
-            "TECHNICAL": """
-                **CURRENT PHASE: TECHNICAL DEEP DIVE**
-
-                **YOUR IMMEDIATE GOAL:**
-                - Pick ONE specific skill from their resume (e.g., Python, React, AWS, etc.)
-                - Ask a HARD, SPECIFIC technical question about that skill
-                - Do NOT accept vague answers - probe for details
-                - Focus on implementation, not just theory
-
-                **What to Cover:**
-                - Architecture decisions
-                - Code quality and best practices  
-                - Problem-solving approach
-                - Real-world experience with the technology
-
-                **Example Questions:**
-                - "I see you used React - how do you handle state management in large applications?"
-                - "You mentioned Python - explain your approach to async programming and when you'd use it"
-                - "Tell me about a time you had to optimize database queries. What was your approach?"
-
-                **CONSTRAINTS:**
-                - ONE question at a time
-                - Make it specific to their resume
-                - Challenge weak or vague answers
-                - Stay in technical territory - NO behavioral questions yet
-                """,
-            "BEHAVIORAL": """
-                **CURRENT PHASE: BEHAVIORAL & SOFT SKILLS**
-
-                **YOUR IMMEDIATE GOAL:**
-                - Shift from technical to behavioral questions
-                - Assess team fit, communication, and work style
-                - Focus on real situations and examples
-
-                **What to Cover:**
-                - Teamwork and collaboration
-                - Handling conflict or pressure
-                - Communication with non-technical stakeholders
-                - Learning from failures
-                - Leadership or mentorship
-
-                **Example Questions:**
-                - "Tell me about a time you disagreed with a team member. How did you handle it?"
-                - "Describe a situation where you had to explain a complex technical concept to a non-technical person"
-                - "What's a project that didn't go as planned? What did you learn?"
-
-                **CONSTRAINTS:**
-                - ONE question at a time
-                - Ask for SPECIFIC examples (use STAR format mentally)
-                - NO more technical questions - you're assessing personality and fit now
-                - Listen for communication skills and self-awareness
-                """,
-            "WRAP_UP": """
-                **CURRENT PHASE: CONCLUSION**
-
-                **YOUR IMMEDIATE GOAL:**
-                - Start wrapping up the interview
-                - Thank {candidate_name} for their time
-                - Ask if they have any questions for you
-                - Provide brief, positive feedback
-                - End the interview gracefully
-
-                **What to Say:**
-                1. "Thank you for your time today, {candidate_name}. You shared some great insights."
-                2. "Before we wrap up - do you have any questions for me about the role or the team?"
-                3. After their response (or if none): "Great! We'll be in touch soon. Thanks again and have a great day!"
-
-                **CONSTRAINTS:**
-                - Keep it SHORT and professional
-                - Be positive (save critical feedback for the written report)
-                - DO NOT ask more interview questions
-                - Make them feel good about the experience
-                - Signal clearly that the interview is ending
-                """
-        }
-        
-        phase_instruction = phase_instructions.get(phase, phase_instructions["INTRODUCTION"]).replace("{candidate_name}", candidate_name)
-        
-        return f"""
-                You are a **Senior Hiring Manager** conducting a professional technical interview for a software engineering role.
-
-                === JOB DESCRIPTION ===
-                {job_description}
-
-                === CANDIDATE RESUME ===
-                {resume_text}
-
-                === YOUR ROLE & RESPONSIBILITIES ===
-                You are evaluating {candidate_name} for this position. Act professionally, analytically, and strategically.
-
-                === CRITICAL INSTRUCTIONS ===
-
-                1. **PROFESSIONAL CONDUCT**
-                - Address the candidate as {candidate_name} occasionally to maintain rapport
-                - Maintain a professional yet conversational tone
-                - Be respectful but evaluative - you're assessing fit for the role
-
-                2. **QUESTION STRATEGY**
-                - Ask **ONE question at a time** - never list multiple questions
-                - **NEVER repeat a question** you've already asked
-                - Review the conversation history carefully before asking
-                - If you've covered a topic, move to a different area
-
-                3. **DYNAMIC FOLLOW-UPS**
-                - **ALWAYS read the candidate's previous answer** before responding
-                - Ask relevant follow-up questions based on their specific answer
-                - If they mention a technology/project, dig deeper into it
-                - If their answer is vague, ask for concrete examples
-                - If their answer is strong, probe edge cases or advanced scenarios
-
-                4. **DIFFICULTY LEVEL: {difficulty.upper()}**
-                {diff_instruction}
-
-                5. **RESPONSE FORMAT**
-                - Keep responses under 3 sentences (will be spoken aloud)
-                - Start by reacting to their answer ("That's interesting...", "I see...", "Good point...")
-                - Then ask your next question naturally
-
-                6. **INTERVIEW FLOW**
-                - If this is the start, warmly ask them to introduce themselves
-                - Cover: background, technical skills, problem-solving, behavioral questions
-                - Adapt based on their resume and the job requirements
-                - Progress logically through topics - don't jump randomly
-
-                7. **EVALUATION MINDSET**
-                - You're not just asking questions - you're assessing competency
-                - Listen for: clarity, depth of knowledge, communication skills
-                - Challenge weak answers politely
-                - Acknowledge strong answers but keep probing
-
-                8. **NAME FIDELITY**
-                - The candidate's official name is **{candidate_name}**
-                - Speech-to-text may generate phonetic errors (e.g., 'Raheem' instead of 'Zayeem')
-                - You must ALWAYS use **{candidate_name}**
-                - If the transcript shows a different but similar-sounding name, assume it is a typo and ignore it
-
-                9. **NO META-TEXT**
-                    - Do NOT include placeholder text like '*Awaiting response*', '[End of turn]', or any actions in asterisks
-                    - Only output the spoken response content without UI cues or status markers
-
-                **Remember:** You have full conversation history. Use it to create a coherent, adaptive interview experience.
-
-                {phase_instruction}
-
-                ⚠️ **CRITICAL:** The CURRENT PHASE instruction above takes ABSOLUTE PRIORITY. Follow it strictly to maintain interview flow.
-            """
+        return "".join(self.build_interview_prompt_segments(
+            job_description, resume_text, candidate_name, difficulty, phase
+        ))
+    
+    def build_interview_prompt_segments(
+        self,
+        job_description: str,
+        resume_text: str,
+        candidate_name: str,
+        difficulty: str = "medium",
+        phase: str = "INTRODUCTION"
+    ) -> Tuple[str, str, str]:
+        return _build_interview_prompt_segments(
+            job_description, resume_text, candidate_name, difficulty, phase
+        )
     
-    def generate_interview_response(
+    def _build_interview_messages(
         self,
         resume_text: str,
         job_description: str,
         candidate_name: str,
         messages: List[Dict[str, str]],
-        difficulty: str = "medium"
-    ) -> str:
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> List[Dict[str, str]]:
 
         self.candidate_name = candidate_name
         
         # Extract first name only for natural conversation
         first_name = candidate_name.split()[0] if candidate_name else "Candidate"
         
-        phase = self.determine_phase(messages)
+        phase = self.determine_phase(messages, assistant_count)
         
-        system_prompt = self.build_interview_system_prompt(
+        prompt_segments = self.build_interview_prompt_segments(
             job_description, resume_text, first_name, difficulty, phase
         )
         
-        api_messages_copy = messages.copy()
-        if api_messages_copy and api_messages_copy[-1].get("role") == "user":
-            original_content = api_messages_copy[-1]["content"]
-            api_messages_copy[-1] = {
+        # Separate system messages keep the stable segments an exact prefix of every request
+        api_messages = [{"role": "system", "content": segment} for segment in prompt_segments]
+        
+        # Only the most recent turns are sent verbatim; the phase above still uses the full history.
+        # The opening message anchors the conversation and is kept too; the turns between it and
+        # the window collapse to the questions already asked, so the no-repeat rule still holds
+        window_start = max(len(messages) - HISTORY_WINDOW, 0)
+        earlier_questions = [
+            msg["content"] for msg in itertools.islice(messages, 1, window_start)
+            if msg.get("role") == "assistant"
+        ]
+        if earlier_questions:
+            api_messages.append({
+                "role": "system",
+                "content": "Questions you already asked earlier in this interview (do not repeat them):\n"
+                + "\n".join(f"- {question}" for question in earlier_questions)
+            })
+        if window_start:
+            api_messages.append(messages[0])
+        
+        # The caller's list and dicts are never mutated; only the outgoing last message is replaced
+        if messages and messages[-1].get("role") == "user":
+            api_messages.extend(itertools.islice(messages, window_start, len(messages) - 1))
+            api_messages.append({
                 "role": "user",
-                "content": f"[System verified name: {first_name}] {original_content}"
-            }
+                "content": f"[System verified name: {first_name}] {messages[-1]['content']}"
+            })
+        else:
+            api_messages.extend(itertools.islice(messages, window_start, None))
+        
+        return api_messages
+    
+    def _response_cache_key(
+        self,
+        kind: str,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> Optional[bytes]:
+        """
+        Exact-match key for a turn's inputs, or None when the reply should not be cached.
+        The closing phase is left uncached so goodbyes keep some variety.
+        """
+        if self.determine_phase(messages, assistant_count) == "WRAP_UP":
+            return None
+        payload = orjson.dumps(
+            [kind, resume_text, job_description, candidate_name, messages, difficulty],
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _response_cache_get(self, key: Optional[bytes]) -> Optional[Tuple[str, Optional[bytes]]]:
+        if key is None:
+            return None
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+        return cached
+    
+    def _response_cache_put(self, key: Optional[bytes], value: Tuple[str, Optional[bytes]]) -> None:
+        if key is None:
+            return
+        self._response_cache[key] = value
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    async def condense_resume(self, resume_text: str) -> str:
+        """
+        Summarize a resume over RESUME_CHAR_LIMIT down to about RESUME_SUMMARY_CHARS, since it is
+        re-sent in the system prompt on every turn. Shorter resumes are returned unchanged, and
+        if summarization fails the resume is truncated instead.
+        """
+        if len(resume_text) <= RESUME_CHAR_LIMIT:
+            return resume_text
+        
+        cache_key = hashlib.blake2b(orjson.dumps(["resume", resume_text]), digest_size=16).digest()
+        cached = self._response_cache_get(cache_key)
+        if cached:
+            return cached[0]
+        
+        try:
+            completion = await self.feedback_batcher.submit(
+                model="llama-3.1-8b-instant",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"""Condense the resume below to at most {RESUME_SUMMARY_CHARS} characters of plain text.
+                        Keep the candidate's name, roles with employers and dates, projects, technical skills, and education.
+                        Do not add anything that is not in the resume."""
+                    },
+                    {"role": "user", "content": resume_text},
+                ],
+                temperature=0.2,
+                max_tokens=500,
+                top_p=1,
+                stream=False,
+            )
+            summary = completion.choices[0].message.content.strip()
+        except Exception as e:
+            logger.warning("Resume summarization failed, truncating instead: %s", e)
+            return resume_text[:RESUME_CHAR_LIMIT]
+        
+        self._response_cache_put(cache_key, (summary, None))
+        return summary
+    
+    async def generate_interview_response(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium"
+    ) -> str:
+
+        # Counted once here and passed down so the history is not rescanned per helper
+        assistant_count = self._count_assistant_turns(messages)
+        cache_key = self._response_cache_key(
+            "text", resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        cached = self._response_cache_get(cache_key)
+        if cached:
+            return cached[0]
         
-        api_messages = [{"role": "system", "content": system_prompt}] + api_messages_copy
+        api_messages = self._build_interview_messages(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
         
         try:
-            completion = self.groq_client.chat.completions.create(
+            completion = await self.chat_batcher.submit(
                 model="llama-3.1-8b-instant",
                 messages=api_messages,
                 temperature=0.6,
@@ -289,50 +660,67 @@ class InterviewService:
             )
             
             raw_response = completion.choices[0].message.content
-            return self._clean_response_text(raw_response)
             
         except Exception as e:
             raise Exception(f"Groq API call failed: {str(e)}")
+        
+        response_text = self._clean_response_text(raw_response)
+        self._response_cache_put(cache_key, (response_text, None))
+        return response_text
     
-    def _sanitize_for_speech(self, text: str) -> str:
+    async def stream_interview_response(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> AsyncIterator[str]:
         """
-        Sanitize text for better TTS pronunciation.
-        Applies pronunciation dictionary for acronyms, technical terms, and names.
+        Stream the raw interviewer response from Groq token by token.
         """
-        # Dictionary of technical terms and names
-        replace_map = {
-            # Acronyms (Force letter-by-letter)
-            r"\bAWS\b": "A. W. S.",
-            r"\bSQL\b": "Sequel",
-            r"\bAPI\b": "A. P. I.",
-            r"\bCEO\b": "C. E. O.",
-            r"\bCTO\b": "C. T. O.",
-            r"\bUI\b": "U. I.",
-            r"\bUX\b": "U. X.",
-            r"\bURL\b": "U. R. L.",
-            r"\bSaaS\b": "Sass",
-            r"\bCI/CD\b": "C. I. C. D.",
-            r"\bJWT\b": "J. W. T.",
+        api_messages = self._build_interview_messages(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        
+        try:
+            stream = await self.chat_batcher.submit(
+                model="llama-3.1-8b-instant",
+                messages=api_messages,
+                temperature=0.6,
+                max_tokens=250,
+                top_p=1,
+                stream=True,
+            )
             
-            # Tech Jargon
-            r"\bKubernetes\b": "Koo-ber-net-ees",
-            r"\bgRPC\b": "G. R. P. C.",
-            r"\bJSON\b": "Jay-sawn",
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
             
-            # Homographs
-            r"\bresume\b": "reh-zoo-may",
-            r"\bResume\b": "Reh-zoo-may",
-            r"\blive\b": "lye-v",  # As in "live server"
-        }
+        except Exception as e:
+            raise Exception(f"Groq API call failed: {str(e)}")
+    
+    def _sanitize_for_speech(self, text: str, candidate_name: Optional[str] = None) -> str:
+        """
+        Sanitize text for better TTS pronunciation.
+        Applies pronunciation dictionary for acronyms, technical terms, and names.
+        """
+        candidate_name = candidate_name or self.candidate_name
         
         # User Name Injection (Dynamic)
-        if self.candidate_name:
-            if "Zayeem" in self.candidate_name:
-                replace_map[fr"\b{re.escape(self.candidate_name)}\b"] = "Zaa-eem"
+        name_pronunciation = None
+        if candidate_name:
+            if "Zayeem" in candidate_name:
+                name_pronunciation = "Zaa-eem"
             # Add more name mappings as needed
         
-        for pattern, replacement in replace_map.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        # Names without a custom pronunciation share the base pattern
+        if name_pronunciation:
+            pattern, replacements = _compile_speech_pattern(candidate_name, name_pronunciation)
+        else:
+            pattern, replacements = _compile_speech_pattern()
+        text = pattern.sub(lambda match: replacements[match.lastindex - 1], text)
         
         return text
     
@@ -349,51 +737,368 @@ class InterviewService:
         text = re.sub(r'\[.*?\]', '', text) 
         return text.strip()
     
-    def text_to_speech(self, text: str) -> Optional[str]:
+    @staticmethod
+    def _tts_model_for_reply(opening_sentence: str) -> str:
+        """
+        Pick the TTS model for a whole streamed reply from its first sentence.
+        """
+        return TTS_MODEL_LONG if len(opening_sentence) >= TTS_LONG_OPENING_CHARS else TTS_MODEL_SHORT
+    
+    async def _synthesize_speech(
+        self,
+        text: str,
+        encoding: Optional[str] = None,
+        candidate_name: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> bytes:
+        """
+        Synthesize a single piece of text with Deepgram and return the raw audio bytes.
+        Callers voicing one reply in several pieces pass the model chosen for the whole reply,
+        so the voice never switches mid-answer; otherwise it is picked from this text's length.
+        Results are kept in an LRU cache so recurring sentences (greetings, reactions like
+        "That's interesting...") skip the Deepgram round-trip.
+        """
+        sanitized_text = self._sanitize_for_speech(text, candidate_name)
+        
+        options = {
+            "model": model or (TTS_MODEL_SHORT if len(sanitized_text) < TTS_SHORT_TEXT_CHARS else TTS_MODEL_LONG),
+        }
+        if encoding:
+            options["encoding"] = encoding
+        
+        cache_key = hashlib.sha256(
+            f"{options['model']}\x00{encoding}\x00{sanitized_text}".encode("utf-8")
+        ).digest()
+        cached_audio = self._tts_cache.get(cache_key)
+        if cached_audio is not None:
+            self._tts_cache.move_to_end(cache_key)
+            return cached_audio
+        
+        response = await self.deepgram_client.asyncspeak.v("1").stream({"text": sanitized_text}, options)
+        audio_data = response.stream.getvalue()
+        
+        self._tts_cache[cache_key] = audio_data
+        if len(self._tts_cache) > TTS_CACHE_SIZE:
+            self._tts_cache.popitem(last=False)
+        
+        return audio_data
+    
+    async def text_to_speech(self, text: str) -> Optional[bytes]:
         try:
-            sanitized_text = self._sanitize_for_speech(text)
-            
-            options = {
-                "model": "aura-asteria-en",
-            }
-            
-            filename = f"temp_{uuid.uuid4()}.wav"
-            
-            # Correct v3 syntax for TTS
-            self.deepgram_client.speak.v("1").save(filename, {"text": sanitized_text}, options)
-            
-            # Read the saved audio file
-            with open(filename, "rb") as audio_file:
-                audio_data = audio_file.read()
-                base64_audio = base64.b64encode(audio_data).decode("utf-8")
-            
-            # Clean up the temporary file
-            if os.path.exists(filename):
-                os.remove(filename)
-            
-            return base64_audio
+            return await self._synthesize_speech(text)
             
         except Exception as e:
-            print(f"TTS Error: {e}")
+            logger.error("TTS Error: %s", e)
             return None
     
-    def process_interview_turn(
+    async def text_to_speech_b64(self, text: str) -> Optional[str]:
+        """
+        Base64 variant of text_to_speech for clients that need audio inside JSON.
+        """
+        audio_data = await self.text_to_speech(text)
+        return base64.b64encode(audio_data).decode("utf-8") if audio_data is not None else None
+    
+    def _semantic_cache_query(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Build the (namespace, answer) pair used for semantic cache lookups.
+        The namespace covers the system prompt and the question being answered, so only
+        answers to the same question in the same interview context can share a reply.
+        Like the exact-match cache, the closing phase is never cached.
+        """
+        if not messages or messages[-1].get("role") != "user":
+            return None
+        if self.determine_phase(messages, assistant_count) == "WRAP_UP":
+            return None
+        
+        api_messages = self._build_interview_messages(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        previous_question = messages[-2].get("content", "") if len(messages) > 1 else ""
+        
+        # The rubric segment is shared by every session, so only the session and phase segments matter
+        session_context, phase_suffix = api_messages[1]["content"], api_messages[2]["content"]
+        namespace = hashlib.blake2b(
+            f"{session_context}\x00{phase_suffix}\x00{previous_question}".encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+        return namespace, messages[-1].get("content", "")
+    
+    async def _stream_sentences(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw interviewer response one sentence at a time, as soon as each ends.
+        Pieces keep their trailing whitespace, so joining them gives back the full response.
+        """
+        buffer = ""
+        async for token in self.stream_interview_response(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        ):
+            buffer += token
+            sentence_start = 0
+            for boundary in SENTENCE_BOUNDARY.finditer(buffer):
+                yield buffer[sentence_start:boundary.end()]
+                sentence_start = boundary.end()
+            buffer = buffer[sentence_start:]
+        if buffer:
+            yield buffer
+    
+    async def _generate_with_speech(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        encoding: Optional[str] = None,
+        assistant_count: Optional[int] = None
+    ) -> Tuple[str, List[asyncio.Task]]:
+        """
+        Stream the interviewer response and start a TTS task for each sentence as soon as
+        it is complete. Returns the cleaned response text and the TTS tasks in sentence order.
+        """
+        pieces = []
+        tts_tasks = []
+        model = None
+        
+        try:
+            async for piece in self._stream_sentences(
+                resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+            ):
+                pieces.append(piece)
+                sentence = self._clean_response_text(piece)
+                if sentence:
+                    model = model or self._tts_model_for_reply(sentence)
+                    # Pass the name explicitly: by the time the task runs, a concurrent turn
+                    # may have replaced self.candidate_name
+                    tts_tasks.append(asyncio.create_task(
+                        self._synthesize_speech(sentence, encoding, candidate_name, model)
+                    ))
+        except Exception:
+            for task in tts_tasks:
+                task.cancel()
+            raise
+        
+        return self._clean_response_text("".join(pieces)), tts_tasks
+    
+    async def _lookup_turn(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium",
+        assistant_count: Optional[int] = None
+    ) -> Tuple[Optional[Tuple[str, Optional[bytes]]], Callable[[str, Optional[bytes]], None]]:
+        """
+        Check the exact-match and semantic caches for a turn. Returns the cached (text, audio)
+        or None, and a callback that stores a freshly generated turn in both caches.
+        Every turn path synthesizes MP3, so /chat, /chat/stream and /chat/events share entries.
+        """
+        cache_key = self._response_cache_key(
+            "turn", resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        cached = self._response_cache_get(cache_key)
+        if cached:
+            return cached, None
+        
+        cache_query = None
+        embedding = None
+        if self.semantic_cache:
+            cache_query = self._semantic_cache_query(
+                resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+            )
+        if cache_query:
+            embedding = await asyncio.to_thread(self.semantic_cache.encode, cache_query[1])
+            cached = self.semantic_cache.lookup(cache_query[0], embedding)
+            if cached:
+                return cached, None
+        
+        def store(response_text: str, audio_data: Optional[bytes]) -> None:
+            self._response_cache_put(cache_key, (response_text, audio_data))
+            if embedding is not None:
+                self.semantic_cache.store(cache_query[0], embedding, response_text, audio_data)
+        
+        return None, store
+    
+    async def process_interview_turn(
         self,
         resume_text: str,
         job_description: str,
         candidate_name: str,
         messages: List[Dict[str, str]],
         difficulty: str = "medium"
-    ) -> Tuple[str, Optional[str]]:
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        Generate the next interviewer turn and its raw audio bytes (encoding is left to the caller).
+        Groq tokens are streamed and each completed sentence is sent to TTS right away,
+        so speech synthesis overlaps with the rest of the generation.
+        """
+        assistant_count = self._count_assistant_turns(messages)
+        cached, store = await self._lookup_turn(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        if cached:
+            return cached
         
-        response_text = self.generate_interview_response(
-            resume_text, job_description, candidate_name, messages, difficulty
+        response_text, tts_tasks = await self._generate_with_speech(
+            resume_text, job_description, candidate_name, messages, difficulty,
+            encoding="mp3", assistant_count=assistant_count
         )
         
-        audio_data = self.text_to_speech(response_text)
+        segments = await asyncio.gather(*tts_tasks, return_exceptions=True)
+        errors = [seg for seg in segments if isinstance(seg, Exception)]
+        if errors:
+            logger.error("TTS Error: %s", errors[0])
+            return response_text, None
+        if not segments:
+            return response_text, None
         
+        # Every turn path requests MP3, which is frame-based, so segments concatenate cleanly
+        audio_data = b"".join(segments)
+        store(response_text, audio_data)
         return response_text, audio_data
     
+    async def stream_interview_turn(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium"
+    ) -> Tuple[str, AsyncIterator[bytes]]:
+        """
+        Generate the next interviewer turn and return its text with an iterator of raw MP3
+        segments, one per sentence, yielded in order as soon as each is synthesized.
+        MP3 is frame-based, so the segments can be written back to back as a single stream.
+        """
+        assistant_count = self._count_assistant_turns(messages)
+        cached, store = await self._lookup_turn(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        if cached:
+            async def cached_audio() -> AsyncIterator[bytes]:
+                if cached[1] is not None:
+                    yield cached[1]
+            return cached[0], cached_audio()
+        
+        response_text, tts_tasks = await self._generate_with_speech(
+            resume_text, job_description, candidate_name, messages, difficulty,
+            encoding="mp3", assistant_count=assistant_count
+        )
+        
+        async def audio_segments() -> AsyncIterator[bytes]:
+            segments = []
+            try:
+                for task in tts_tasks:
+                    segments.append(await task)
+                    yield segments[-1]
+            except Exception as e:
+                logger.error("TTS Error: %s", e)
+                return
+            finally:
+                for task in tts_tasks:
+                    task.cancel()
+            if segments:
+                store(response_text, b"".join(segments))
+        
+        return response_text, audio_segments()
+    
+    async def stream_interview_events(
+        self,
+        resume_text: str,
+        job_description: str,
+        candidate_name: str,
+        messages: List[Dict[str, str]],
+        difficulty: str = "medium"
+    ) -> AsyncIterator[Dict[str, Optional[str]]]:
+        """
+        Generate the next interviewer turn as a sequence of events for server-sent streaming.
+        Yields {"type": "sentence", "text", "audio"} per sentence (base64 MP3, None if TTS failed)
+        in order, as soon as that sentence is synthesized, while Groq may still be generating
+        the rest; then a final {"type": "done", "response"} with the full cleaned reply.
+        A cached turn is emitted as a single sentence event carrying the whole reply.
+        """
+        assistant_count = self._count_assistant_turns(messages)
+        cached, store = await self._lookup_turn(
+            resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+        )
+        if cached:
+            response_text, audio_data = cached
+            yield {
+                "type": "sentence",
+                "text": response_text,
+                "audio": base64.b64encode(audio_data).decode("utf-8") if audio_data is not None else None
+            }
+            yield {"type": "done", "response": response_text}
+            return
+        
+        pending: asyncio.Queue = asyncio.Queue()
+        pieces = []
+        segments = []
+        
+        async def produce_sentences() -> None:
+            model = None
+            try:
+                async for piece in self._stream_sentences(
+                    resume_text, job_description, candidate_name, messages, difficulty, assistant_count
+                ):
+                    pieces.append(piece)
+                    sentence = self._clean_response_text(piece)
+                    if sentence:
+                        model = model or self._tts_model_for_reply(sentence)
+                        task = asyncio.create_task(
+                            self._synthesize_speech(sentence, "mp3", candidate_name, model)
+                        )
+                        await pending.put((sentence, task))
+            finally:
+                await pending.put(None)
+        
+        producer = asyncio.create_task(produce_sentences())
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+                sentence, task = item
+                try:
+                    segment = await task
+                    segments.append(segment)
+                    audio_data = base64.b64encode(segment).decode("utf-8")
+                except Exception as e:
+                    logger.error("TTS Error: %s", e)
+                    segments.append(None)
+                    audio_data = None
+                yield {"type": "sentence", "text": sentence, "audio": audio_data}
+            
+            # Surfaces Groq errors raised while producing sentences
+            await producer
+            response_text = self._clean_response_text("".join(pieces))
+            # Only fully voiced replies are cached, matching process_interview_turn
+            if segments and None not in segments:
+                store(response_text, b"".join(segments))
+            yield {"type": "done", "response": response_text}
+        finally:
+            producer.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+    
     def build_feedback_system_prompt(self) -> str:
         return """
             You are a **Senior Technical Interviewer Manager** conducting a thorough post-interview evaluation.
@@ -474,8 +1179,10 @@ class InterviewService:
             **Your goal:** Provide honest, evidence-based feedback that helps the candidate improve based on what ACTUALLY happened.
         """
     
-    def generate_feedback(self, messages: List[Dict[str, str]]) -> Dict:
-
+    def _short_interview_feedback(self, messages: List[Dict[str, str]]) -> Optional[Dict]:
+        """
+        Canned feedback for interviews too short to evaluate, or None if the interview is long enough.
+        """
         user_messages = [msg for msg in messages if msg.get("role") == "user"]
         
         if len(user_messages) < 3:
@@ -488,24 +1195,241 @@ class InterviewService:
                     "Practice mock interviews to build confidence for longer sessions"
                 ]
             }
-        
+        return None
+    
+    def _build_feedback_request(self, messages: List[Dict[str, str]]) -> Dict:
         system_prompt = self.build_feedback_system_prompt()
         api_messages = [{"role": "system", "content": system_prompt}] + messages
         
+        return {
+            "model": "llama-3.1-8b-instant",
+            "messages": api_messages,
+            "temperature": 0.2,
+            "max_tokens": 1000,
+            "top_p": 1,
+            "stream": False,
+            "response_format": {"type": "json_object"},
+        }
+    
+    async def generate_feedback(self, messages: List[Dict[str, str]]) -> Dict:
+
+        short_feedback = self._short_interview_feedback(messages)
+        if short_feedback:
+            return short_feedback
+        
         try:
-            completion = self.groq_client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=api_messages,
-                temperature=0.2,
-                max_tokens=1000,
-                top_p=1,
-                stream=False,
-                response_format={"type": "json_object"}
-            )
+            completion = await self.feedback_batcher.submit(**self._build_feedback_request(messages))
             
             feedback_json = completion.choices[0].message.content
-            return json.loads(feedback_json)
+            return orjson.loads(feedback_json)
             
         except Exception as e:
             raise Exception(f"Feedback generation failed: {str(e)}")
-
+    
+    async def generate_feedback_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream feedback as it is generated. Yields {"type": "field", "field", "value"} as each
+        top-level key of the feedback object closes (rating first, then feedback, then
+        improvements), then a final {"type": "done", "feedback"} with the whole object.
+        """
+        short_feedback = self._short_interview_feedback(messages)
+        if short_feedback:
+            for key, value in short_feedback.items():
+                yield {"type": "field", "field": key, "value": value}
+            yield {"type": "done", "feedback": short_feedback}
+            return
+        
+        request = self._build_feedback_request(messages)
+        # Groq's JSON mode can't be streamed; the prompt already pins the output to one JSON object
+        del request["response_format"]
+        request["stream"] = True
+        
+        feedback = {}
+        buffer = ""
+        position = None
+        try:
+            stream = await self.feedback_batcher.submit(**request)
+            
+            async for chunk in stream:
+                if not (chunk.choices and chunk.choices[0].delta.content):
+                    continue
+                buffer += chunk.choices[0].delta.content
+                
+                if position is None:
+                    start = buffer.find("{")
+                    if start < 0:
+                        continue
+                    position = start + 1
+                
+                fields, position = _closed_json_fields(buffer, position)
+                for key, value in fields:
+                    feedback[key] = value
+                    yield {"type": "field", "field": key, "value": value}
+            
+        except Exception as e:
+            raise Exception(f"Feedback generation failed: {str(e)}")
+        
+        if not feedback:
+            raise Exception("Feedback generation failed: response contained no JSON fields")
+        yield {"type": "done", "feedback": feedback}
+    
+    async def _create_feedback_batch(self, requests: Dict[str, Dict]) -> str:
+        """
+        Upload one JSONL line per (custom_id, chat request) and start a batch over them.
+        Returns the batch id.
+        """
+        batch_file = b"".join(
+            orjson.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body,
+            }) + b"\n"
+            for custom_id, body in requests.items()
+        )
+        
+        upload = await self.groq_client.post(
+            "/openai/v1/files",
+            cast_to=httpx.Response,
+            body={"purpose": "batch"},
+            files=[("file", ("feedback.jsonl", batch_file, "application/jsonl"))],
+            options={"headers": {"Content-Type": "multipart/form-data"}},
+        )
+        batch = await self.groq_client.post(
+            "/openai/v1/batches",
+            cast_to=httpx.Response,
+            body={
+                "input_file_id": orjson.loads(upload.content)["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+            },
+        )
+        return orjson.loads(batch.content)["id"]
+    
+    async def _poll_feedback_batch(self, batch_id: str) -> Tuple[str, Dict[str, Dict]]:
+        """
+        Fetch a batch's status and, once it has completed, its parsed feedback by custom_id.
+        Lines that errored or did not return valid JSON are left out.
+        """
+        batch_response = await self.groq_client.get(
+            f"/openai/v1/batches/{batch_id}", cast_to=httpx.Response
+        )
+        batch = orjson.loads(batch_response.content)
+        
+        if batch["status"] in ("failed", "expired", "cancelled", "cancelling"):
+            return "failed", {}
+        if batch["status"] != "completed":
+            return "pending", {}
+        # A batch whose every line failed completes with only an error file
+        if not batch.get("output_file_id"):
+            return "completed", {}
+        
+        output = await self.groq_client.get(
+            f"/openai/v1/files/{batch['output_file_id']}/content", cast_to=httpx.Response
+        )
+        feedback = {}
+        for line in output.content.splitlines():
+            try:
+                result = orjson.loads(line)
+                feedback_json = result["response"]["body"]["choices"][0]["message"]["content"]
+                feedback[result["custom_id"]] = orjson.loads(feedback_json)
+            except (KeyError, IndexError, TypeError, orjson.JSONDecodeError):
+                continue
+        return "completed", feedback
+    
+    async def submit_feedback_batch(self, messages: List[Dict[str, str]]) -> Dict:
+        """
+        Queue feedback generation on Groq's Batch API, which is billed at a discount and does
+        not count against the real-time rate limits used by /chat. Results can take up to the
+        24h completion window; poll them with get_feedback_batch.
+        """
+        short_feedback = self._short_interview_feedback(messages)
+        if short_feedback:
+            return {"status": "completed", "feedback": short_feedback}
+        
+        try:
+            batch_id = await self._create_feedback_batch(
+                {FEEDBACK_BATCH_CUSTOM_ID: self._build_feedback_request(messages)}
+            )
+            return {"status": "pending", "batch_id": batch_id}
+            
+        except Exception as e:
+            raise Exception(f"Feedback batch submission failed: {str(e)}")
+    
+    async def get_feedback_batch(self, batch_id: str) -> Dict:
+        """
+        Check a feedback batch. Returns {"status": "pending"}, {"status": "failed"},
+        or {"status": "completed", "feedback": {...}}.
+        """
+        try:
+            status, feedback = await self._poll_feedback_batch(batch_id)
+            
+            if status != "completed":
+                return {"status": status}
+            if FEEDBACK_BATCH_CUSTOM_ID in feedback:
+                return {"status": "completed", "feedback": feedback[FEEDBACK_BATCH_CUSTOM_ID]}
+            
+            return {"status": "failed"}
+            
+        except Exception as e:
+            raise Exception(f"Feedback batch retrieval failed: {str(e)}")
+    
+    async def generate_feedback_batch(
+        self,
+        sessions: List[List[Dict[str, str]]],
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 60.0,
+        timeout: float = 3600.0
+    ) -> List[Dict]:
+        """
+        Score many finished interviews in one Groq batch (offline/export use, not live turns).
+        Polls with exponential backoff until the batch finishes or timeout seconds pass, then
+        falls back to generate_feedback for any session whose batch line failed, at most
+        FEEDBACK_FALLBACK_CONCURRENCY at a time.
+        Returns one feedback dict per session, in order; a session whose fallback also fails
+        gets {"error": message} instead of failing the others.
+        """
+        results: List[Optional[Dict]] = [self._short_interview_feedback(messages) for messages in sessions]
+        pending = {f"session-{index}": index for index, result in enumerate(results) if result is None}
+        requests = {custom_id: self._build_feedback_request(sessions[index]) for custom_id, index in pending.items()}
+        
+        if requests:
+            try:
+                batch_id = await self._create_feedback_batch(requests)
+                
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                delay = poll_interval
+                while True:
+                    status, feedback = await self._poll_feedback_batch(batch_id)
+                    if status != "pending":
+                        break
+                    if loop.time() + delay > deadline:
+                        raise TimeoutError(f"Batch {batch_id} still pending after {timeout}s")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, max_poll_interval)
+                
+            except Exception as e:
+                logger.error("Feedback batch failed, falling back to live calls: %s", e)
+                feedback = {}
+            
+            for custom_id, index in pending.items():
+                results[index] = feedback.get(custom_id)
+        
+        limit = asyncio.Semaphore(FEEDBACK_FALLBACK_CONCURRENCY)
+        
+        async def fallback(messages: List[Dict[str, str]]) -> Dict:
+            async with limit:
+                return await self.generate_feedback(messages)
+        
+        missing = [index for index, result in enumerate(results) if result is None]
+        fallbacks = await asyncio.gather(
+            *(fallback(sessions[index]) for index in missing), return_exceptions=True
+        )
+        for index, result in zip(missing, fallbacks):
+            if isinstance(result, Exception):
+                logger.error("Feedback fallback failed for session %d: %s", index, result)
+                result = {"error": str(result)}
+            results[index] = result
+        
+        return results
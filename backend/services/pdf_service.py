@@ -3,28 +3,89 @@ PDF Processing Service
 Handles PDF text extraction and sanitization.
 """
 
+import re
+import hashlib
+import threading
+from collections import OrderedDict
 from pypdf import PdfReader
 from io import BytesIO
+from typing import BinaryIO, Union
+
+
+# Number of extracted PDFs kept in memory, keyed by content hash
+PDF_CACHE_SIZE = 256
+
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Line breaks, tabs, page-break form feeds and non-breaking spaces all become plain spaces
+# in a single str.translate pass; runs of spaces are then collapsed
+_WHITESPACE_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " ", "\f": " ", "\xa0": " "})
+_MULTISPACE = re.compile(r" {2,}")
 
 
 class PDFService:
     """Service for processing PDF files and extracting text."""
     
+    # Shared by all instances; process_pdf runs in worker threads, hence the lock
+    _text_cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _text_cache_lock = threading.Lock()
+    
     @staticmethod
-    def extract_text_from_pdf(pdf_file: bytes) -> str:
-        text = ""
-        pdf_reader = PdfReader(BytesIO(pdf_file))
-
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+    def extract_text_from_pdf(pdf_file: Union[bytes, BinaryIO]) -> str:
+        """
+        Accepts raw bytes or a seekable file object (e.g. an upload's spooled temp file),
+        so large uploads can be parsed without first being copied into memory.
+        """
+        pdf_reader = PdfReader(BytesIO(pdf_file) if isinstance(pdf_file, bytes) else pdf_file)
 
-        return text
+        # Pages resolve their objects lazily from the one shared stream, so extract them in order
+        return "".join(page.extract_text() or "" for page in pdf_reader.pages)
+    
+    @staticmethod
+    def is_pdf(pdf_file: Union[bytes, BinaryIO]) -> bool:
+        """
+        Check the %PDF- magic number without parsing; file objects are rewound afterwards.
+        """
+        if isinstance(pdf_file, bytes):
+            return pdf_file[:5] == b"%PDF-"
+        header = pdf_file.read(5)
+        pdf_file.seek(0)
+        return header == b"%PDF-"
     
     @staticmethod
     def sanitize_text(text: str) -> str:
-        return text.replace("\n", " ").strip()
+        return _MULTISPACE.sub(" ", text.translate(_WHITESPACE_TABLE)).strip()
     
     @staticmethod
-    def process_pdf(pdf_file: bytes) -> str:
-        raw_text = PDFService.extract_text_from_pdf(pdf_file)
-        return PDFService.sanitize_text(raw_text)
+    def content_hash(pdf_file: Union[bytes, BinaryIO]) -> bytes:
+        """
+        SHA-256 of the file contents; file objects are hashed in chunks and rewound.
+        """
+        if isinstance(pdf_file, bytes):
+            return hashlib.sha256(pdf_file).digest()
+        digest = hashlib.sha256()
+        while chunk := pdf_file.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        pdf_file.seek(0)
+        return digest.digest()
+    
+    @classmethod
+    def process_pdf(cls, pdf_file: Union[bytes, BinaryIO]) -> str:
+        """
+        Extract and sanitize text, reusing the result when the same file was seen before
+        (e.g. the same resume uploaded for several interviews).
+        """
+        key = cls.content_hash(pdf_file)
+        with cls._text_cache_lock:
+            cached = cls._text_cache.get(key)
+            if cached is not None:
+                cls._text_cache.move_to_end(key)
+                return cached
+        
+        text = cls.sanitize_text(cls.extract_text_from_pdf(pdf_file))
+        
+        with cls._text_cache_lock:
+            cls._text_cache[key] = text
+            if len(cls._text_cache) > PDF_CACHE_SIZE:
+                cls._text_cache.popitem(last=False)
+        return text
@@ -0,0 +1,136 @@
+"""
+Semantic Cache Service
+Reuses interviewer replies for candidate answers that are near-duplicates of ones already seen.
+"""
+
+import os
+import math
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are still atomic, just not serialized across workers
+    fcntl = None
+
+
+CacheEntry = Tuple[List[float], str, Optional[bytes]]
+
+
+class SemanticCache:
+    """
+    In-process embedding cache mapping (namespace, candidate answer) -> (response, audio).
+
+    The namespace pins a hit to the same interview context (system prompt and the question
+    being answered); within it, answers whose cosine similarity reaches the threshold share
+    a cached reply. Embeddings come from sentence-transformers unless an encoder is injected.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_path: Optional[str] = None,
+        max_namespaces: int = 1024,
+        max_entries_per_namespace: int = 64,
+        encoder: Optional[Callable[[str], List[float]]] = None
+    ):
+        self.threshold = threshold
+        self.model_name = model_name
+        self.cache_path = cache_path
+        self.max_namespaces = max_namespaces
+        self.max_entries_per_namespace = max_entries_per_namespace
+
+        self._encoder = encoder
+        self._encoder_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, List[CacheEntry]]" = OrderedDict()
+
+        if self.cache_path:
+            self._entries = self._load()
+
+    def _load(self) -> "OrderedDict[str, List[CacheEntry]]":
+        """
+        Read the cache file, treating a missing or unreadable file as empty.
+        """
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                return OrderedDict(pickle.load(cache_file))
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return OrderedDict()
+
+    def encode(self, text: str) -> List[float]:
+        """
+        Embed text as a unit vector. CPU-bound, so call it off the event loop.
+        """
+        with self._encoder_lock:
+            if self._encoder is None:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(self.model_name)
+                self._encoder = lambda value: model.encode(value).tolist()
+
+        vector = list(self._encoder(text))
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[Tuple[str, Optional[bytes]]]:
+        with self._lock:
+            entries = self._entries.get(namespace)
+            if not entries:
+                return None
+            self._entries.move_to_end(namespace)
+
+            best_score, best_entry = max(
+                ((sum(a * b for a, b in zip(embedding, entry[0])), entry) for entry in entries),
+                key=lambda scored: scored[0]
+            )
+
+        if best_score < self.threshold:
+            return None
+        return best_entry[1], best_entry[2]
+
+    def store(self, namespace: str, embedding: List[float], response: str, audio: Optional[bytes]) -> None:
+        with self._lock:
+            entries = self._entries.setdefault(namespace, [])
+            self._entries.move_to_end(namespace)
+            entries.append((embedding, response, audio))
+
+            if len(entries) > self.max_entries_per_namespace:
+                del entries[0]
+            if len(self._entries) > self.max_namespaces:
+                self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """
+        Merge this process's entries into the cache file and replace it atomically.
+        Every uvicorn worker saves to the same path on shutdown, so entries other workers
+        already wrote are kept, and a reader never sees a half-written file.
+        """
+        if not self.cache_path:
+            return
+        with self._lock, open(f"{self.cache_path}.lock", "a") as lock_file:
+            # Serialize the read-merge-write with other workers saving to the same path
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            merged = self._load()
+            for namespace, entries in self._entries.items():
+                # Each worker loaded the same file at startup, so skip entries already on disk
+                combined = merged.pop(namespace, []) + entries
+                seen = set()
+                unique = []
+                for entry in reversed(combined):
+                    key = (tuple(entry[0]), entry[1])
+                    if key not in seen:
+                        seen.add(key)
+                        unique.append(entry)
+                merged[namespace] = unique[:self.max_entries_per_namespace][::-1]
+            while len(merged) > self.max_namespaces:
+                merged.popitem(last=False)
+
+            directory = os.path.dirname(os.path.abspath(self.cache_path))
+            with tempfile.NamedTemporaryFile("wb", dir=directory, delete=False) as cache_file:
+                pickle.dump(merged, cache_file)
+            os.replace(cache_file.name, self.cache_path)
@@ -3,301 +3,334 @@ Unit tests for backend service logic.
 Tests InterviewService and PDFService functions without making real API calls.
 """
 
-import sys
 import os
-from pathlib import Path
-
-# Add parent directory to path to import services
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
+import io
+import copy
+import functools
+import re
+import asyncio
+import base64
+import httpx
+from collections import OrderedDict
+from types import MappingProxyType, SimpleNamespace as NS
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from services.interview_service import InterviewService
+from groq import AsyncGroq
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from services.interview_service import InterviewService, _compile_speech_pattern
 from services.pdf_service import PDFService
+from services.audio_service import AudioService, looks_like_audio
+from services.semantic_cache import SemanticCache
+from services.completion_batcher import CompletionBatcher
+from services import clients
+
+
+@pytest.fixture(scope="session")
+def interview_service():
+    """One InterviewService shared by the pure-logic tests; tests that set attributes use interview_service_isolated."""
+    return InterviewService(groq_api_key="test", deepgram_api_key="test")
+
+
+@pytest.fixture
+def interview_service_isolated(interview_service):
+    """A shallow copy of the shared service for tests that set attributes on it."""
+    return copy.copy(interview_service)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def patched_sdks():
+    """Patch the Groq, Deepgram and pypdf entry points once for the whole module, for every test."""
+    with patch('groq.AsyncGroq') as groq_class, \
+         patch('deepgram.DeepgramClient') as deepgram_class, \
+         patch('services.pdf_service.PdfReader') as pdf_reader:
+        yield groq_class, deepgram_class, pdf_reader
+
+
+def _fresh(mock_class):
+    """Give a test a clean view of a module-wide patch: no call history, no configured returns, no shared clients."""
+    # reset_mock(return_value=True) would also reset MagicMock's __hash__, which the client registry needs
+    mock_class.reset_mock()
+    mock_class.return_value = MagicMock()
+    mock_class.side_effect = None
+    clients._clients.clear()
+    return mock_class
+
+
+@pytest.fixture
+def mock_groq_class(patched_sdks):
+    return _fresh(patched_sdks[0])
+
+
+@pytest.fixture
+def mock_deepgram_class(patched_sdks):
+    return _fresh(patched_sdks[1])
+
+
+@pytest.fixture
+def mock_pdf_reader(patched_sdks):
+    return _fresh(patched_sdks[2])
+
+
+# Response stubs are only read, never verified, so plain namespaces stand in for Mock
+def _canned_completion(text):
+    """A non-streaming chat completion whose only choice has the given content."""
+    return NS(choices=[NS(message=NS(content=text))])
+
+
+def _canned_chunk(token):
+    """A streamed chat completion chunk carrying one token."""
+    return NS(choices=[NS(delta=NS(content=token))])
+
+
+# Read-only response shapes, built once and shared by every test that needs them
+CANNED_GREAT = _canned_completion("Great answer! Tell me more.")
+CANNED_FEEDBACK = _canned_completion('{"rating": 7, "feedback": "Solid.", "improvements": []}')
+CANNED_RESUME_SUMMARY = _canned_completion(" Condensed resume ")
+
+
+def _message(role, content):
+    """A read-only chat message, safe to share between parametrized cases."""
+    return MappingProxyType({"role": role, "content": content})
+
+
+TECHNICAL_MESSAGES = (
+    _message("assistant", "Hello!"),
+    _message("user", "Hi there"),
+    _message("assistant", "Tell me about yourself"),
+    _message("user", "I'm a developer"),
+    _message("assistant", "What technologies do you use?"),
+)
+
+BEHAVIORAL_MESSAGES = (
+    _message("assistant", "Message 1"),
+    _message("user", "Response 1"),
+    _message("assistant", "Message 2"),
+    _message("user", "Response 2"),
+    _message("assistant", "Message 3"),
+    _message("user", "Response 3"),
+    _message("assistant", "Message 4"),
+    _message("user", "Response 4"),
+    _message("assistant", "Message 5"),
+)
+
+# Only 2 assistant messages among the user turns, so still TECHNICAL
+MIXED_ROLE_MESSAGES = (
+    _message("user", "User 1"),
+    _message("user", "User 2"),
+    _message("assistant", "Assistant 1"),
+    _message("user", "User 3"),
+    _message("assistant", "Assistant 2"),
+    _message("user", "User 4"),
+)
 
 
 class TestInterviewServiceDeterminePhase:
     """Test the state machine logic for interview phases."""
     
-    def test_phase_introduction_no_messages(self):
-        """Test that 0 assistant messages returns INTRODUCTION phase."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = []
-        phase = service.determine_phase(messages)
-        assert phase == "INTRODUCTION"
-    
-    def test_phase_introduction_one_message(self):
-        """Test that 1 assistant message returns INTRODUCTION phase."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = [
-            {"role": "assistant", "content": "Hello!"}
-        ]
-        phase = service.determine_phase(messages)
-        assert phase == "INTRODUCTION"
+    @pytest.mark.parametrize("messages,expected", [
+        ((), "INTRODUCTION"),
+        ((_message("assistant", "Hello!"),), "INTRODUCTION"),
+        (TECHNICAL_MESSAGES, "TECHNICAL"),
+        (BEHAVIORAL_MESSAGES, "BEHAVIORAL"),
+        (tuple(_message("assistant", f"Message {i}") for i in range(8)), "WRAP_UP"),
+        (MIXED_ROLE_MESSAGES, "TECHNICAL"),
+    ], ids=["empty", "one_assistant", "technical", "behavioral", "wrap_up", "mixed_roles"])
+    def test_determine_phase(self, interview_service, messages, expected):
+        """Test that the phase follows the number of assistant messages only."""
+        assert interview_service.determine_phase(messages) == expected
     
-    def test_phase_technical(self):
-        """Test that 3 assistant messages returns TECHNICAL phase."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = [
-            {"role": "assistant", "content": "Hello!"},
-            {"role": "user", "content": "Hi there"},
-            {"role": "assistant", "content": "Tell me about yourself"},
-            {"role": "user", "content": "I'm a developer"},
-            {"role": "assistant", "content": "What technologies do you use?"},
-        ]
-        phase = service.determine_phase(messages)
-        assert phase == "TECHNICAL"
-    
-    def test_phase_behavioral(self):
-        """Test that 5 assistant messages returns BEHAVIORAL phase."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = [
-            {"role": "assistant", "content": "Message 1"},
-            {"role": "user", "content": "Response 1"},
-            {"role": "assistant", "content": "Message 2"},
-            {"role": "user", "content": "Response 2"},
-            {"role": "assistant", "content": "Message 3"},
-            {"role": "user", "content": "Response 3"},
-            {"role": "assistant", "content": "Message 4"},
-            {"role": "user", "content": "Response 4"},
-            {"role": "assistant", "content": "Message 5"},
-        ]
-        phase = service.determine_phase(messages)
-        assert phase == "BEHAVIORAL"
-    
-    def test_phase_wrap_up(self):
-        """Test that 8 assistant messages returns WRAP_UP phase."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = [
-            {"role": "assistant", "content": f"Message {i}"}
-            for i in range(8)
-        ]
-        phase = service.determine_phase(messages)
-        assert phase == "WRAP_UP"
-    
-    def test_phase_counts_only_assistant_messages(self):
-        """Test that only assistant messages are counted, not user messages."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        messages = [
-            {"role": "user", "content": "User 1"},
-            {"role": "user", "content": "User 2"},
-            {"role": "assistant", "content": "Assistant 1"},
-            {"role": "user", "content": "User 3"},
-            {"role": "assistant", "content": "Assistant 2"},
-            {"role": "user", "content": "User 4"},
+    def test_phase_from_precomputed_count(self, interview_service):
+        """Test that a caller-supplied assistant count is used instead of rescanning messages."""
+        assert [interview_service.determine_phase([], count) for count in (0, 1, 2, 4, 5, 7, 8, 20)] == [
+            "INTRODUCTION", "INTRODUCTION", "TECHNICAL", "TECHNICAL",
+            "BEHAVIORAL", "BEHAVIORAL", "WRAP_UP", "WRAP_UP",
         ]
-        # Only 2 assistant messages, should be TECHNICAL (assistant_count <= 4)
-        phase = service.determine_phase(messages)
-        assert phase == "TECHNICAL"
+
+
+SANITIZE_CASES = [
+    ("I worked with AWS infrastructure.", "A. W. S.", "AWS"),
+    ("I know SQL and database design.", "Sequel", "SQL"),
+    ("I built a REST API.", "A. P. I.", "API"),
+    ("I parse JSON data.", "Jay-sawn", "JSON"),
+    ("I saw on your resume that you have experience.", "reh-zoo-may", None),
+]
+
+# Every spoken form and original from SANITIZE_CASES, so one scan finds all of them
+SANITIZE_CHECKER = re.compile("|".join(
+    re.escape(needle) for case in SANITIZE_CASES for needle in case[1:] if needle
+))
+
+
+def _has_all(text, parts):
+    return all(part in text for part in parts)
+
+
+def _has_none(text, parts):
+    return not any(part in text for part in parts)
 
 
 class TestInterviewServiceSanitizeForSpeech:
     """Test text sanitization for better TTS pronunciation."""
     
-    def test_sanitize_aws(self):
-        """Test that AWS becomes A. W. S."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        text = "I worked with AWS infrastructure."
-        result = service._sanitize_for_speech(text)
-        assert "A. W. S." in result
-        assert "AWS" not in result
-    
-    def test_sanitize_sql(self):
-        """Test that SQL becomes Sequel."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        text = "I know SQL and database design."
-        result = service._sanitize_for_speech(text)
-        assert "Sequel" in result
-        assert "SQL" not in result
+    @pytest.mark.parametrize("text,must_contain,must_not_contain", SANITIZE_CASES, ids=["aws", "sql", "api", "json", "resume"])
+    def test_sanitize(self, interview_service, text, must_contain, must_not_contain):
+        """Test that each acronym or word is replaced by its spoken form."""
+        hits = set(SANITIZE_CHECKER.findall(interview_service._sanitize_for_speech(text)))
+        assert must_contain in hits
+        assert must_not_contain not in hits
     
-    def test_sanitize_api(self):
-        """Test that API becomes A. P. I."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        text = "I built a REST API."
-        result = service._sanitize_for_speech(text)
-        assert "A. P. I." in result
-        assert "API" not in result
-    
-    def test_sanitize_resume(self):
-        """Test that resume becomes reh-zoo-may."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        text = "I saw on your resume that you have experience."
-        result = service._sanitize_for_speech(text)
-        assert "reh-zoo-may" in result
-        assert "resume" not in result.lower() or "reh-zoo-may" in result
-    
-    def test_sanitize_candidate_name_zayeem(self):
-        """Test that Zayeem becomes Zaa-eem when set as candidate name."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        service.candidate_name = "Zayeem"
+    def test_sanitize_candidate_name_zayeem(self, interview_service, interview_service_isolated):
+        """Test that Zayeem becomes Zaa-eem when set as candidate name, without touching the shared service."""
+        interview_service_isolated.candidate_name = "Zayeem"
         text = "Hello Zayeem, tell me about yourself."
-        result = service._sanitize_for_speech(text)
+        result = interview_service_isolated._sanitize_for_speech(text)
+        assert "Zaa-eem" in result
+        assert interview_service.candidate_name != "Zayeem"
+    
+    def test_sanitize_explicit_name_overrides_attribute(self, interview_service_isolated):
+        """Test that a name passed in wins over the service's current candidate name."""
+        interview_service_isolated.candidate_name = "Sam"
+        result = interview_service_isolated._sanitize_for_speech("Hello Zayeem.", "Zayeem")
         assert "Zaa-eem" in result
     
-    def test_sanitize_complex_sentence(self):
+    def test_sanitize_compiles_name_pattern_once(self, interview_service):
+        """Test that the name-specific pattern is built once per name and other names share the base pattern."""
+        _compile_speech_pattern.cache_clear()
+        for _ in range(3):
+            interview_service._sanitize_for_speech("Hi Zayeem Q. Tester, what about SQL?", "Zayeem Q. Tester")
+            interview_service._sanitize_for_speech("Hi Sam, what about SQL?", "Sam")
+            interview_service._sanitize_for_speech("Hi Alex, what about SQL?", "Alex")
+        
+        # One pattern for Zayeem's pronunciation and one base pattern shared by Sam and Alex
+        cache_info = _compile_speech_pattern.cache_info()
+        assert cache_info.misses == 2
+        assert cache_info.hits == 7
+    
+    def test_sanitize_complex_sentence(self, interview_service):
         """Test complex sentence with multiple replacements."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
         text = "I used SQL and AWS on my resume."
-        result = service._sanitize_for_speech(text)
+        result = interview_service._sanitize_for_speech(text)
         
-        # Check all replacements are present
-        assert "Sequel" in result
-        assert "A. W. S." in result
-        assert "reh-zoo-may" in result
-        
-        # Check originals are not present
-        assert "SQL" not in result
-        assert "AWS" not in result
+        assert _has_all(result, ("Sequel", "A. W. S.", "reh-zoo-may"))
+        assert _has_none(result, ("SQL", "AWS"))
     
-    def test_sanitize_case_insensitive(self):
+    def test_sanitize_case_insensitive(self, interview_service):
         """Test that replacements work with different cases."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
         text = "I use aws, AWS, and Aws."
-        result = service._sanitize_for_speech(text)
+        result = interview_service._sanitize_for_speech(text)
         # All variations should be replaced
         assert result.count("A. W. S.") >= 2  # At least the uppercase ones
     
-    def test_sanitize_json(self):
-        """Test that JSON becomes Jay-sawn."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        text = "I parse JSON data."
-        result = service._sanitize_for_speech(text)
-        assert "Jay-sawn" in result
-    
-    def test_sanitize_multiple_acronyms(self):
+    def test_sanitize_multiple_acronyms(self, interview_service):
         """Test multiple acronyms in one sentence."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
         text = "The API uses JWT for authentication with AWS."
-        result = service._sanitize_for_speech(text)
-        assert "A. P. I." in result
-        assert "J. W. T." in result
-        assert "A. W. S." in result
+        result = interview_service._sanitize_for_speech(text)
+        assert _has_all(result, ("A. P. I.", "J. W. T.", "A. W. S."))
+
+
+# Difficulty and phase needles come from the templates, so they are checked against placeholder inputs
+PROMPT_MODE_CASES = [
+    ("hard", "TECHNICAL", ["HARD MODE", "SCALABILITY"]),
+    ("easy", "INTRODUCTION", ["EASY MODE", "ENCOURAGING", "BASIC CONCEPTS"]),
+    ("medium", "TECHNICAL", ["TECHNICAL DEEP DIVE", "specific skill"]),
+    ("medium", "WRAP_UP", ["CONCLUSION", "Thank", "questions"]),
+]
+
+PROMPT_INPUT_CASES = [
+    (
+        dict(job_description="Data Scientist", resume_text="Python, ML, TensorFlow",
+             candidate_name="Zayeem Zaki", difficulty="medium", phase="INTRODUCTION"),
+        "Zayeem Zaki",
+    ),
+    (
+        dict(job_description="Senior DevOps Engineer with 5+ years experience", resume_text="DevOps, Docker, Kubernetes",
+             candidate_name="Sam Wilson", difficulty="hard", phase="TECHNICAL"),
+        "Senior DevOps Engineer with 5+ years experience",
+    ),
+    (
+        dict(job_description="Cloud Architect", resume_text="10 years of experience with cloud architecture",
+             candidate_name="Taylor Morgan", difficulty="hard", phase="TECHNICAL"),
+        "10 years of experience with cloud architecture",
+    ),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_skeleton(service, difficulty, phase):
+    """The prompt for one (difficulty, phase) with placeholder session inputs, built once per test run."""
+    return service.build_interview_system_prompt(
+        job_description="__J__", resume_text="__R__", candidate_name="__C__",
+        difficulty=difficulty, phase=phase
+    )
 
 
 class TestInterviewServiceBuildSystemPrompt:
     """Test system prompt generation with different parameters."""
     
-    def test_prompt_contains_hard_mode_text(self):
-        """Test that hard difficulty includes 'HARD MODE' text."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        prompt = service.build_interview_system_prompt(
-            job_description="Software Engineer",
-            resume_text="5 years of Python",
-            candidate_name="John Doe",
-            difficulty="hard",
-            phase="TECHNICAL"
-        )
-        
-        # Check for hard mode indicators
-        assert "HARD MODE" in prompt or "System Design" in prompt
-        assert "SCALABILITY" in prompt or "scalability" in prompt.lower()
+    @pytest.mark.parametrize("difficulty,phase,needles", PROMPT_MODE_CASES, ids=[
+        "hard_mode", "easy_mode", "technical_phase", "wrap_up_phase",
+    ])
+    def test_prompt_contains_mode_text(self, interview_service, difficulty, phase, needles):
+        """Test that the difficulty and phase instructions show up in the prompt."""
+        prompt = _prompt_skeleton(interview_service, difficulty, phase)
+        for needle in needles:
+            assert needle in prompt
     
-    def test_prompt_contains_easy_mode_text(self):
-        """Test that easy difficulty includes encouraging language."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        prompt = service.build_interview_system_prompt(
-            job_description="Junior Developer",
-            resume_text="Recent graduate",
-            candidate_name="Jane Smith",
-            difficulty="easy",
-            phase="INTRODUCTION"
-        )
-        
-        # Check for easy mode indicators
-        assert "EASY MODE" in prompt
-        assert "ENCOURAGING" in prompt or "encouraging" in prompt.lower()
-        assert "BASIC CONCEPTS" in prompt or "basic" in prompt.lower()
+    @pytest.mark.parametrize("kwargs,needle", PROMPT_INPUT_CASES, ids=[
+        "candidate_name", "job_description", "resume_text",
+    ])
+    def test_prompt_contains_session_inputs(self, interview_service, kwargs, needle):
+        """Test that the candidate name, job description and resume are included in the prompt."""
+        assert needle in interview_service.build_interview_system_prompt(**kwargs)
     
-    def test_prompt_contains_technical_phase_text(self):
-        """Test that TECHNICAL phase includes deep dive instructions."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        prompt = service.build_interview_system_prompt(
-            job_description="Backend Developer",
-            resume_text="Python, Django, PostgreSQL",
-            candidate_name="Alex Johnson",
-            difficulty="medium",
-            phase="TECHNICAL"
-        )
+    def test_prompt_is_reused_across_turns(self, interview_service):
+        """Test that identical session inputs reuse the cached prompt segments."""
+        args = ("Backend Developer", "Go, gRPC", "Robin Park", "medium", "TECHNICAL")
         
-        # Check for technical phase indicators
-        assert "TECHNICAL DEEP DIVE" in prompt
-        assert "specific skill" in prompt.lower() or "resume" in prompt.lower()
-    
-    def test_prompt_contains_wrap_up_phase_text(self):
-        """Test that WRAP_UP phase includes conclusion instructions."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        prompt = service.build_interview_system_prompt(
-            job_description="Full Stack Developer",
-            resume_text="React, Node.js",
-            candidate_name="Chris Lee",
-            difficulty="medium",
-            phase="WRAP_UP"
-        )
+        first = interview_service.build_interview_prompt_segments(*args)
+        second = interview_service.build_interview_prompt_segments(*args)
         
-        # Check for wrap up indicators
-        assert "CONCLUSION" in prompt or "WRAP" in prompt
-        assert "Thank" in prompt or "thank" in prompt.lower()
-        assert "questions" in prompt.lower()
+        assert all(a is b for a, b in zip(first, second))
+        assert interview_service.build_interview_system_prompt(*args) == "".join(first)
     
-    def test_prompt_includes_candidate_name(self):
-        """Test that candidate name is included in the prompt."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        candidate_name = "Zayeem Zaki"
-        prompt = service.build_interview_system_prompt(
-            job_description="Data Scientist",
-            resume_text="Python, ML, TensorFlow",
-            candidate_name=candidate_name,
-            difficulty="medium",
-            phase="INTRODUCTION"
+    def test_prompt_segments_share_static_prefix(self, interview_service):
+        """Test that the rubric segment is identical across sessions and session data comes after it."""
+        first = interview_service.build_interview_prompt_segments(
+            "Backend Developer", "Go, gRPC", "Robin Park", "medium", "TECHNICAL"
         )
-        
-        assert candidate_name in prompt
-    
-    def test_prompt_includes_job_description(self):
-        """Test that job description is included in the prompt."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        job_description = "Senior DevOps Engineer with 5+ years experience"
-        prompt = service.build_interview_system_prompt(
-            job_description=job_description,
-            resume_text="DevOps, Docker, Kubernetes",
-            candidate_name="Sam Wilson",
-            difficulty="hard",
-            phase="TECHNICAL"
+        second = interview_service.build_interview_prompt_segments(
+            "Data Scientist", "Python, ML", "Sam Wilson", "hard", "WRAP_UP"
         )
         
-        assert job_description in prompt
+        assert first[0] is second[0]
+        assert "Robin Park" not in first[0]
+        assert "Candidate: Robin Park; Difficulty: MEDIUM" in first[1]
+        assert "TECHNICAL DEEP DIVE" in first[2]
+        assert interview_service.build_interview_system_prompt(
+            "Backend Developer", "Go, gRPC", "Robin Park", "medium", "TECHNICAL"
+        ) == "".join(first)
     
-    def test_prompt_includes_resume_text(self):
-        """Test that resume text is included in the prompt."""
-        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
-        resume_text = "10 years of experience with cloud architecture"
-        prompt = service.build_interview_system_prompt(
-            job_description="Cloud Architect",
-            resume_text=resume_text,
-            candidate_name="Taylor Morgan",
-            difficulty="hard",
-            phase="TECHNICAL"
-        )
+    def test_session_context_is_reused_across_phases(self, interview_service):
+        """Test that moving to a new phase only swaps the phase suffix segment."""
+        args = ("Backend Developer", "Go, gRPC", "Robin Park", "medium")
+        
+        technical = interview_service.build_interview_prompt_segments(*args, "TECHNICAL")
+        behavioral = interview_service.build_interview_prompt_segments(*args, "BEHAVIORAL")
         
-        assert resume_text in prompt
+        assert technical[1] is behavioral[1]
+        assert technical[2] != behavioral[2]
 
 
 class TestInterviewServiceWithMocking:
     """Test InterviewService methods that require API mocking."""
     
-    @patch('services.interview_service.Groq')
     def test_generate_interview_response_calls_groq(self, mock_groq_class):
         """Test that generate_interview_response calls Groq API correctly."""
         # Setup mock
         mock_groq_instance = Mock()
         mock_groq_class.return_value = mock_groq_instance
         
-        mock_completion = Mock()
-        mock_completion.choices = [Mock()]
-        mock_completion.choices[0].message.content = "Great answer! Tell me more."
-        
-        mock_groq_instance.chat.completions.create.return_value = mock_completion
+        mock_groq_instance.chat.completions.create = AsyncMock(return_value=CANNED_GREAT)
         
         # Create service with mocked Groq
         service = InterviewService(groq_api_key="test_key", deepgram_api_key="test_key")
@@ -306,57 +339,682 @@ class TestInterviewServiceWithMocking:
         messages = [
             {"role": "user", "content": "I have 5 years of Python experience."}
         ]
-        response = service.generate_interview_response(
+        response = asyncio.run(service.generate_interview_response(
             resume_text="Python developer",
             job_description="Senior Python Engineer",
             candidate_name="Test User",
             messages=messages,
             difficulty="medium"
-        )
+        ))
         
         # Assertions
         assert response == "Great answer! Tell me more."
-        mock_groq_instance.chat.completions.create.assert_called_once()
+        mock_groq_instance.chat.completions.create.assert_awaited_once()
+    
+    def test_long_history_is_windowed(self):
+        """Test that only the opening and recent turns are sent verbatim and older questions are summarized."""
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        messages = []
+        for i in range(8):
+            messages.append({"role": "assistant", "content": f"Question {i}?"})
+            messages.append({"role": "user", "content": f"Answer {i}"})
+        
+        api_messages = service._build_interview_messages(
+            resume_text="Python developer",
+            job_description="Senior Python Engineer",
+            candidate_name="Test User",
+            messages=messages,
+        )
+        
+        # Phase still reflects the whole interview (8 assistant messages)
+        assert "CURRENT PHASE: CONCLUSION" in api_messages[2]["content"]
+        assert api_messages[3]["role"] == "system"
+        assert "Question 0?" not in api_messages[3]["content"]
+        assert "- Question 1?" in api_messages[3]["content"]
+        assert "- Question 2?" in api_messages[3]["content"]
+        assert "Question 3?" not in api_messages[3]["content"]
+        # The opening message is kept verbatim ahead of the recent window
+        assert api_messages[4] == messages[0]
+        assert api_messages[5:-1] == messages[-10:-1]
+        assert api_messages[-1]["content"].endswith("Answer 7")
+    
+    def test_build_messages_leaves_caller_history_untouched(self):
+        """Test that the name prefix is added to an outgoing copy, not the caller's messages."""
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        messages = [
+            {"role": "assistant", "content": "Tell me about yourself."},
+            {"role": "user", "content": "I build APIs."},
+        ]
+        
+        api_messages = service._build_interview_messages(
+            resume_text="Python developer",
+            job_description="Senior Python Engineer",
+            candidate_name="Test User",
+            messages=messages,
+        )
+        
+        assert api_messages[-1]["content"] == "[System verified name: Test] I build APIs."
+        assert messages[-1]["content"] == "I build APIs."
+        assert api_messages[-2] is messages[0]
+    
+    def test_generate_feedback_parses_json(self, mock_groq_class):
+        """Test that generate_feedback returns the parsed JSON from Groq."""
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        
+        mock_groq_instance.chat.completions.create = AsyncMock(return_value=CANNED_FEEDBACK)
+        
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        messages = [{"role": "user", "content": f"Answer {i}"} for i in range(3)]
+        
+        feedback = asyncio.run(service.generate_feedback(messages))
+        
+        assert feedback == {"rating": 7, "feedback": "Solid.", "improvements": []}
     
-    @patch('services.interview_service.DeepgramClient')
-    @patch('builtins.open', create=True)
-    @patch('os.remove')
-    def test_text_to_speech_calls_deepgram(self, mock_remove, mock_open, mock_deepgram_class):
+    def test_generate_feedback_stream_emits_fields_as_they_close(self, mock_groq_class):
+        """Test that streamed feedback yields each top-level field before the object is finished."""
+        tokens = ['{"rat', 'ing": 8', ', "feedback": "Solid ', 'answers."', ', "improvements": ["More depth"]', '}']
+        seen_tokens = []
+        
+        async def fake_stream():
+            for token in tokens:
+                seen_tokens.append(token)
+                yield _canned_chunk(token)
+        
+        create = AsyncMock(return_value=fake_stream())
+        mock_groq_class.return_value.chat.completions.create = create
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        messages = [{"role": "user", "content": f"Answer {i}"} for i in range(3)]
+        
+        async def collect():
+            events = []
+            async for event in service.generate_feedback_stream(messages):
+                events.append((event, len(seen_tokens)))
+            return events
+        
+        events = asyncio.run(collect())
+        
+        # rating is emitted as soon as the comma after it arrives, long before the end
+        assert events[0] == ({"type": "field", "field": "rating", "value": 8}, 3)
+        assert [event["field"] for event, _ in events[:3]] == ["rating", "feedback", "improvements"]
+        assert events[-1][0] == {
+            "type": "done",
+            "feedback": {"rating": 8, "feedback": "Solid answers.", "improvements": ["More depth"]},
+        }
+        assert create.call_args.kwargs["stream"] is True
+        assert "response_format" not in create.call_args.kwargs
+    
+    def test_feedback_batch_round_trip(self):
+        """Test submitting feedback to the Groq Batch API and reading the result back."""
+        requests = []
+        feedback_line = (
+            '{"custom_id": "feedback", "response": {"body": {"choices": '
+            '[{"message": {"content": "{\\"rating\\": 8}"}}]}}}\n'
+        )
+        
+        def handler(request):
+            requests.append(request)
+            path = request.url.path
+            if path == "/openai/v1/files":
+                return httpx.Response(200, json={"id": "file_in"})
+            if path == "/openai/v1/batches":
+                return httpx.Response(200, json={"id": "batch_1", "status": "validating"})
+            if path == "/openai/v1/batches/batch_1":
+                return httpx.Response(200, json={"id": "batch_1", "status": "completed", "output_file_id": "file_out"})
+            if path == "/openai/v1/files/file_out/content":
+                return httpx.Response(200, content=feedback_line.encode())
+            return httpx.Response(404)
+        
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        # groq.AsyncGroq is patched for every test (autouse patched_sdks), so hand the service
+        # a real client, imported before the patch, over the mock transport
+        service.groq_client = AsyncGroq(api_key="test", http_client=http_client)
+        messages = [{"role": "user", "content": f"Answer {i}"} for i in range(3)]
+        
+        async def run():
+            submitted = await service.submit_feedback_batch(messages)
+            return submitted, await service.get_feedback_batch(submitted["batch_id"])
+        
+        submitted, result = asyncio.run(run())
+        
+        assert submitted == {"status": "pending", "batch_id": "batch_1"}
+        assert result == {"status": "completed", "feedback": {"rating": 8}}
+        assert b'"custom_id":"feedback"' in requests[0].content
+        assert b'"completion_window":"24h"' in requests[1].content.replace(b" ", b"")
+
+    def test_feedback_batch_poll_finishes_on_failed_lines(self):
+        """Test that an all-errors batch completes instead of pending forever, and garbage lines are skipped."""
+        batches = {
+            "batch_errors": {"id": "batch_errors", "status": "completed", "error_file_id": "file_err"},
+            "batch_mixed": {"id": "batch_mixed", "status": "completed", "output_file_id": "file_out"},
+        }
+        output = (
+            b'{"custom_id": "feedback", "respo\n'
+            b'{"custom_id": "session-1", "response": {"body": {"choices": '
+            b'[{"message": {"content": "{\\"rating\\": 6}"}}]}}}\n'
+        )
+
+        def handler(request):
+            path = request.url.path
+            if path.startswith("/openai/v1/batches/"):
+                return httpx.Response(200, json=batches[path.rsplit("/", 1)[1]])
+            if path == "/openai/v1/files/file_out/content":
+                return httpx.Response(200, content=output)
+            return httpx.Response(404)
+
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service.groq_client = AsyncGroq(
+            api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+
+        async def run():
+            return (
+                await service.get_feedback_batch("batch_errors"),
+                await service._poll_feedback_batch("batch_mixed"),
+            )
+
+        errors, mixed = asyncio.run(run())
+
+        assert errors == {"status": "failed"}
+        assert mixed == ("completed", {"session-1": {"rating": 6}})
+
+    def test_generate_feedback_batch_polls_and_falls_back(self):
+        """Test multi-session batch feedback: polling, short-interview shortcut and live fallback."""
+        polls = []
+        output = (
+            b'{"custom_id": "session-0", "response": {"body": {"choices": [{"message": {"content": "{\\"rating\\": 7}"}}]}}}\n'
+            b'{"custom_id": "session-2", "error": {"message": "rate limited"}}\n'
+        )
+        
+        def handler(request):
+            path = request.url.path
+            if path == "/openai/v1/files":
+                return httpx.Response(200, json={"id": "file_in"})
+            if path == "/openai/v1/batches":
+                return httpx.Response(200, json={"id": "batch_1", "status": "validating"})
+            if path == "/openai/v1/batches/batch_1":
+                polls.append(request)
+                status = "completed" if len(polls) > 1 else "in_progress"
+                return httpx.Response(200, json={"id": "batch_1", "status": status, "output_file_id": "file_out"})
+            if path == "/openai/v1/files/file_out/content":
+                return httpx.Response(200, content=output)
+            return httpx.Response(404)
+        
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        # groq.AsyncGroq is patched for every test (autouse patched_sdks), so hand the service
+        # a real client, imported before the patch, over the mock transport
+        service.groq_client = AsyncGroq(api_key="test", http_client=http_client)
+        service.generate_feedback = AsyncMock(return_value={"rating": 5})
+        
+        long_session = [{"role": "user", "content": f"Answer {i}"} for i in range(3)]
+        short_session = [{"role": "user", "content": "Hi"}]
+        
+        results = asyncio.run(service.generate_feedback_batch(
+            [long_session, short_session, long_session], poll_interval=0
+        ))
+        
+        assert len(polls) == 2
+        assert results[0] == {"rating": 7}
+        assert results[1]["rating"] == 0
+        assert results[2] == {"rating": 5}
+        service.generate_feedback.assert_awaited_once_with(long_session)
+
+    def test_generate_feedback_batch_fallback_is_bounded_and_isolated(self):
+        """Test that a stuck batch times out, fallbacks are rate-capped, and one failure spares the rest."""
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service._create_feedback_batch = AsyncMock(return_value="batch_1")
+        service._poll_feedback_batch = AsyncMock(return_value=("pending", {}))
+        in_flight = []
+        peak = []
+
+        async def fake_feedback(messages):
+            in_flight.append(messages)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0)
+            in_flight.remove(messages)
+            if messages[0]["content"] == "Answer 0 of 2":
+                raise Exception("Feedback generation failed: rate limited")
+            return {"rating": 6}
+
+        service.generate_feedback = fake_feedback
+        sessions = [
+            [{"role": "user", "content": f"Answer {i} of {n}"} for i in range(3)]
+            for n in range(10)
+        ]
+
+        results = asyncio.run(service.generate_feedback_batch(sessions, poll_interval=0.01, timeout=0.05))
+
+        assert results[2] == {"error": "Feedback generation failed: rate limited"}
+        assert all(result == {"rating": 6} for index, result in enumerate(results) if index != 2)
+        assert max(peak) <= 4
+
+    def test_text_to_speech_calls_deepgram(self, mock_deepgram_class):
         """Test that text_to_speech calls Deepgram API correctly."""
         # Setup mocks
         mock_deepgram_instance = Mock()
         mock_deepgram_class.return_value = mock_deepgram_instance
         
-        # Mock file operations
-        mock_file = MagicMock()
-        mock_file.read.return_value = b"fake_audio_data"
-        mock_file.__enter__.return_value = mock_file
-        mock_open.return_value = mock_file
+        mock_speak_response = Mock()
+        mock_speak_response.stream = io.BytesIO(b"fake_audio_data")
+        mock_deepgram_instance.asyncspeak.v.return_value.stream = AsyncMock(return_value=mock_speak_response)
         
         # Create service
         service = InterviewService(groq_api_key="test", deepgram_api_key="test")
         
         # Call the method
-        result = service.text_to_speech("Hello world")
+        result = asyncio.run(service.text_to_speech("Hello world"))
         
         # Assertions
-        assert result is not None
-        assert isinstance(result, str)  # Should return base64 string
+        assert result == b"fake_audio_data"  # Raw bytes; base64 is only for JSON clients
+        assert asyncio.run(service.text_to_speech_b64("Hello world")) == base64.b64encode(b"fake_audio_data").decode()
+        mock_deepgram_instance.asyncspeak.v.return_value.stream.assert_awaited_once()
+    
+    def test_text_to_speech_reuses_cached_audio(self, mock_deepgram_class):
+        """Test that repeated text is synthesized only once."""
+        mock_deepgram_instance = Mock()
+        mock_deepgram_class.return_value = mock_deepgram_instance
+        
+        mock_speak_response = Mock()
+        mock_speak_response.stream = io.BytesIO(b"fake_audio_data")
+        mock_deepgram_instance.asyncspeak.v.return_value.stream = AsyncMock(return_value=mock_speak_response)
+        
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        
+        first = asyncio.run(service.text_to_speech("Tell me about yourself."))
+        second = asyncio.run(service.text_to_speech("Tell me about yourself."))
+        
+        assert first == second
+        mock_deepgram_instance.asyncspeak.v.return_value.stream.assert_awaited_once()
+
+    def test_text_to_speech_model_depends_on_length(self, mock_deepgram_class):
+        """Test that short text uses the low-latency model and long text the higher-throughput one."""
+        mock_deepgram_instance = Mock()
+        mock_deepgram_class.return_value = mock_deepgram_instance
+
+        mock_speak_response = Mock()
+        mock_speak_response.stream = io.BytesIO(b"fake_audio_data")
+        speak = mock_deepgram_instance.asyncspeak.v.return_value.stream = AsyncMock(return_value=mock_speak_response)
+
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+
+        asyncio.run(service.text_to_speech("Tell me about yourself."))
+        asyncio.run(service.text_to_speech("Walk me through a system you designed. " * 10))
+
+        assert [call.args[1]["model"] for call in speak.await_args_list] == ["aura-asteria-en", "aura-2-asteria-en"]
+
+    def test_streamed_reply_uses_one_tts_model(self, mock_deepgram_class):
+        """Test that every sentence of a reply is voiced with the model picked from its opening sentence."""
+        speak = mock_deepgram_class.return_value.asyncspeak.v.return_value.stream = AsyncMock(
+            side_effect=lambda source, options: Mock(stream=io.BytesIO(b"mp3"))
+        )
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        opening = "That is a thorough walkthrough of how you partitioned the ingestion pipeline across three regions and shards. "
+
+        async def fake_sentences(resume_text, job_description, candidate_name, messages, difficulty, assistant_count=None):
+            for sentence in (opening, "Why?"):
+                yield sentence
+
+        service._stream_sentences = fake_sentences
+
+        async def run():
+            _, tasks = await service._generate_with_speech("", "", "Test User", [])
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+
+        assert [call.args[1]["model"] for call in speak.await_args_list] == ["aura-2-asteria-en"] * 2
+
+    def test_process_interview_turn_speaks_each_sentence(self, mock_groq_class, mock_deepgram_class):
+        """Test that streamed sentences are sent to TTS individually and merged."""
+        chunks = [_canned_chunk(token) for token in ["Great answer. ", "How did you ", "test it?"]]
+        
+        async def fake_stream():
+            for chunk in chunks:
+                yield chunk
+        
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        mock_groq_instance.chat.completions.create = AsyncMock(return_value=fake_stream())
+        
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service._synthesize_speech = AsyncMock(side_effect=[b"first", b"second"])
+        
+        response, audio = asyncio.run(service.process_interview_turn(
+            resume_text="Python developer",
+            job_description="Senior Python Engineer",
+            candidate_name="Test User",
+            messages=[{"role": "user", "content": "I write unit tests."}],
+        ))
+        
+        assert response == "Great answer. How did you test it?"
+        assert service._synthesize_speech.await_count == 2
+        assert audio == b"firstsecond"
+
+    def test_turn_counts_assistant_messages_once(self, mock_groq_class):
+        """Test that a turn scans the history for its phase once and passes the count down."""
+        async def fake_stream():
+            yield _canned_chunk("Great answer.")
+
+        mock_groq_class.return_value.chat.completions.create = AsyncMock(return_value=fake_stream())
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service._synthesize_speech = AsyncMock(return_value=b"mp3")
+
+        with patch.object(
+            InterviewService, "_count_assistant_turns", wraps=InterviewService._count_assistant_turns
+        ) as count:
+            asyncio.run(service.process_interview_turn("", "", "Test User", [dict(msg) for msg in TECHNICAL_MESSAGES]))
+
+        assert count.call_count == 1
+
+    def test_concurrent_turns_keep_their_own_candidate_name(self, mock_deepgram_class):
+        """Test that a turn's TTS uses its own candidate name even if another turn starts first."""
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        
+        async def fake_sentences(resume_text, job_description, candidate_name, messages, difficulty, assistant_count=None):
+            yield f"Welcome {candidate_name}."
+        
+        service._stream_sentences = fake_sentences
+        spoken = []
+        mock_deepgram_class.return_value.asyncspeak.v.return_value.stream = AsyncMock(
+            side_effect=lambda source, options: spoken.append(source["text"]) or Mock(stream=io.BytesIO(b"mp3"))
+        )
+        
+        async def run():
+            _, zayeem_tasks = await service._generate_with_speech("", "", "Zayeem", [])
+            # Another interview starts before the first turn's TTS task has run
+            service.candidate_name = "Sam"
+            await asyncio.gather(*zayeem_tasks)
+        
+        asyncio.run(run())
+        
+        assert spoken == ["Welcome Zaa-eem."]
+    
+    def test_identical_turn_is_served_from_response_cache(self, mock_groq_class):
+        """Test that repeating a turn's exact inputs skips Groq and TTS, except when wrapping up."""
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        
+        async def fake_generate(*args, **kwargs):
+            async def speak():
+                return b"audio"
+            return "Tell me more.", [asyncio.create_task(speak())]
+        
+        service._generate_with_speech = AsyncMock(side_effect=fake_generate)
+        
+        async def run(messages):
+            return await service.process_interview_turn(
+                resume_text="Python developer",
+                job_description="Senior Python Engineer",
+                candidate_name="Test User",
+                messages=messages,
+            )
+        
+        intro = [{"role": "user", "content": "Hello"}]
+        first = asyncio.run(run(intro))
+        second = asyncio.run(run(intro))
+        
+        assert first == second
+        assert service._generate_with_speech.call_count == 1
+        
+        wrap_up = [{"role": "assistant", "content": f"Question {i}?"} for i in range(8)] + intro
+        asyncio.run(run(wrap_up))
+        asyncio.run(run(wrap_up))
+        
+        assert service._generate_with_speech.call_count == 3
+
+    def test_streaming_turns_share_the_response_cache(self, mock_groq_class):
+        """Test that /chat/events and /chat/stream replay a cached turn without calling Groq."""
+        chunks = [_canned_chunk(token) for token in ["First. ", "Second?"]]
+
+        async def fake_stream():
+            for chunk in chunks:
+                yield chunk
+
+        create = AsyncMock(return_value=fake_stream())
+        mock_groq_class.return_value.chat.completions.create = create
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service._synthesize_speech = AsyncMock(side_effect=[b"one", b"two"])
+        kwargs = dict(
+            resume_text="Python developer",
+            job_description="Senior Python Engineer",
+            candidate_name="Test User",
+            messages=[{"role": "user", "content": "Hi"}],
+        )
+
+        async def run():
+            generated = [event async for event in service.stream_interview_events(**kwargs)]
+            replayed = [event async for event in service.stream_interview_events(**kwargs)]
+            text, audio_stream = await service.stream_interview_turn(**kwargs)
+            return generated, replayed, text, [segment async for segment in audio_stream]
+
+        generated, replayed, text, segments = asyncio.run(run())
+
+        assert len(generated) == 3
+        assert replayed == [
+            {"type": "sentence", "text": "First. Second?", "audio": base64.b64encode(b"onetwo").decode()},
+            {"type": "done", "response": "First. Second?"},
+        ]
+        assert (text, segments) == ("First. Second?", [b"onetwo"])
+        create.assert_awaited_once()
+        assert service._synthesize_speech.await_count == 2
+
+    def test_stream_interview_turn_yields_segments_in_order(self, mock_groq_class, mock_deepgram_class):
+        """Test that streamed audio segments come back per sentence, in order, as MP3."""
+        chunks = [_canned_chunk(token) for token in ["First. ", "Second?"]]
+        
+        async def fake_stream():
+            for chunk in chunks:
+                yield chunk
+        
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        mock_groq_instance.chat.completions.create = AsyncMock(return_value=fake_stream())
+        
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        
+        async def fake_synthesize(sentence, encoding=None, candidate_name=None, model=None):
+            # Finish the first sentence last to check ordering
+            await asyncio.sleep(0.02 if sentence == "First." else 0)
+            return f"{sentence}|{encoding}".encode()
+        
+        service._synthesize_speech = fake_synthesize
+        
+        async def run():
+            text, audio_stream = await service.stream_interview_turn(
+                resume_text="Python developer",
+                job_description="Senior Python Engineer",
+                candidate_name="Test User",
+                messages=[{"role": "user", "content": "Hi"}],
+            )
+            return text, [segment async for segment in audio_stream]
+        
+        text, segments = asyncio.run(run())
+        
+        assert text == "First. Second?"
+        assert segments == [b"First.|mp3", b"Second?|mp3"]
+    
+    def test_stream_interview_events_before_generation_finishes(self, mock_groq_class, mock_deepgram_class):
+        """Test that the first sentence event is emitted while Groq is still generating."""
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test")
+        service._synthesize_speech = AsyncMock(return_value=b"mp3")
+        
+        async def run():
+            first_event_seen = asyncio.Event()
+            
+            async def fake_stream():
+                yield _canned_chunk("First. ")
+                # Only continue once the consumer has the first sentence
+                await first_event_seen.wait()
+                yield _canned_chunk("Second?")
+            
+            mock_groq_instance.chat.completions.create = AsyncMock(return_value=fake_stream())
+            events = []
+            async for event in service.stream_interview_events(
+                resume_text="Python developer",
+                job_description="Senior Python Engineer",
+                candidate_name="Test User",
+                messages=[{"role": "user", "content": "Hi"}],
+            ):
+                events.append(event)
+                first_event_seen.set()
+            return events
+        
+        events = asyncio.run(asyncio.wait_for(run(), timeout=2))
+        
+        audio = base64.b64encode(b"mp3").decode()
+        assert events == [
+            {"type": "sentence", "text": "First.", "audio": audio},
+            {"type": "sentence", "text": "Second?", "audio": audio},
+            {"type": "done", "response": "First. Second?"},
+        ]
+    
+    def test_condense_resume(self, mock_groq_class):
+        """Test that only long resumes are summarized, and each one only once."""
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        mock_groq_instance.chat.completions.create = AsyncMock(return_value=CANNED_RESUME_SUMMARY)
+
+        service = InterviewService(groq_api_key="test_key", deepgram_api_key="test_key")
+        long_resume = "Python developer. " * 500
+
+        assert asyncio.run(service.condense_resume("Python developer")) == "Python developer"
+        assert asyncio.run(service.condense_resume(long_resume)) == "Condensed resume"
+        assert asyncio.run(service.condense_resume(long_resume)) == "Condensed resume"
+        mock_groq_instance.chat.completions.create.assert_awaited_once()
+
+    def test_condense_resume_truncates_on_failure(self, mock_groq_class):
+        """Test that a failed summarization falls back to a truncated resume."""
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        mock_groq_instance.chat.completions.create = AsyncMock(side_effect=Exception("rate limited"))
+
+        service = InterviewService(groq_api_key="test_key", deepgram_api_key="test_key")
+        long_resume = "x" * 10000
+
+        assert asyncio.run(service.condense_resume(long_resume)) == "x" * 6000
+
+
+class TestAudioService:
+    """Test AudioService transcription."""
+    
+    def test_transcribe_audio_uses_async_client(self, mock_deepgram_class):
+        """Test that transcription awaits Deepgram's async prerecorded client."""
+        mock_deepgram_instance = Mock()
+        mock_deepgram_class.return_value = mock_deepgram_instance
+        
+        mock_alternative = Mock(transcript="Hello there")
+        mock_response = Mock()
+        mock_response.results.channels = [Mock(alternatives=[mock_alternative])]
+        transcribe_file = AsyncMock(return_value=mock_response)
+        mock_deepgram_instance.listen.asyncprerecorded.v.return_value.transcribe_file = transcribe_file
+        
+        service = AudioService(api_key="test")
+        result = asyncio.run(service.transcribe_audio(b"RIFF fake audio"))
+        
+        assert result == "Hello there"
+        transcribe_file.assert_awaited_once()
+    
+    def test_transcribe_stream_forwards_chunks(self, mock_deepgram_class):
+        """Test that streamed uploads reach Deepgram as a chunked stream source."""
+        mock_deepgram_instance = Mock()
+        mock_deepgram_class.return_value = mock_deepgram_instance
+        
+        forwarded = []
+        
+        async def fake_transcribe(payload, options):
+            async for chunk in payload["stream"]:
+                forwarded.append(chunk)
+            mock_response = Mock()
+            mock_response.results.channels = [Mock(alternatives=[Mock(transcript="Streamed")])]
+            return mock_response
+        
+        mock_deepgram_instance.listen.asyncprerecorded.v.return_value.transcribe_file = fake_transcribe
+        
+        async def chunks():
+            yield b"RIFF"
+            yield b"rest of audio"
+        
+        service = AudioService(api_key="test")
+        result = asyncio.run(service.transcribe_stream(chunks()))
+        
+        assert result == "Streamed"
+        assert forwarded == [b"RIFF", b"rest of audio"]
+    
+    def test_transcribe_audio_rejects_unknown_format(self):
+        """Test that uploads without a known audio signature never reach Deepgram."""
+        service = AudioService(api_key="test")
+        
+        with pytest.raises(ValueError, match="Unsupported audio format"):
+            asyncio.run(service.transcribe_audio(b"%PDF-1.7 not audio"))
+    
+    def test_looks_like_audio_accepts_browser_formats(self):
+        """Test that WebM (Chrome/Firefox) and MP4 (Safari) recordings are accepted."""
+        assert looks_like_audio(b"\x1aE\xdf\xa3\x9fB\x86\x81")
+        assert looks_like_audio(b"\x00\x00\x00\x1cftypM4A ")
+        assert not looks_like_audio(b"<html>")
+    
+    @patch('services.audio_service.MAX_AUDIO_BYTES', 8)
+    def test_transcribe_stream_rejects_oversized_upload(self, mock_deepgram_class):
+        """Test that a stream is cut off with ValueError once it exceeds the size limit."""
+        async def fake_transcribe(payload, options):
+            async for _ in payload["stream"]:
+                pass
+        
+        mock_deepgram_class.return_value.listen.asyncprerecorded.v.return_value.transcribe_file = fake_transcribe
+        
+        async def chunks():
+            yield b"RIFF"
+            yield b"0123456789"
+        
+        service = AudioService(api_key="test")
+        with pytest.raises(ValueError, match="too large"):
+            asyncio.run(service.transcribe_stream(chunks()))
+    
+    def test_transcribe_stream_rejects_empty_upload(self):
+        """Test that an upload with no chunks is rejected."""
+        async def no_chunks():
+            return
+            yield
+        
+        service = AudioService(api_key="test")
+        
+        with pytest.raises(ValueError):
+            asyncio.run(service.transcribe_stream(no_chunks()))
+    
+    def test_transcribe_audio_rejects_empty_input(self):
+        """Test that empty audio is rejected before calling Deepgram."""
+        service = AudioService(api_key="test")
+        
+        with pytest.raises(ValueError):
+            asyncio.run(service.transcribe_audio(b""))
+
+
+class TestClients:
+    """Test the process-wide SDK client registry."""
+    
+    def test_services_share_one_deepgram_client(self, mock_deepgram_class):
+        """Test that services with the same key reuse a single process-wide client."""
+        audio_service = AudioService(api_key="shared-key")
+        interview_service = InterviewService(groq_api_key="test", deepgram_api_key="shared-key")
+        
+        assert audio_service.client is interview_service.deepgram_client
+        assert AudioService(api_key="shared-key").client is audio_service.client
+        mock_deepgram_class.assert_called_once_with(api_key="shared-key")
 
 
 class TestPDFService:
     """Test PDFService functionality."""
     
-    @patch('services.pdf_service.PdfReader')
     def test_extract_text_from_valid_pdf(self, mock_pdf_reader):
         """Test extracting text from a valid PDF file."""
         # Setup mock
-        mock_page = Mock()
-        mock_page.extract_text.return_value = "Sample resume text"
+        mock_page = NS(extract_text=lambda: "Sample resume text")
         
-        mock_reader_instance = Mock()
-        mock_reader_instance.pages = [mock_page]
-        mock_pdf_reader.return_value = mock_reader_instance
+        mock_pdf_reader.return_value = NS(pages=[mock_page])
         
         # Create service and test
         service = PDFService()
@@ -366,18 +1024,13 @@ class TestPDFService:
         assert result == "Sample resume text"
         mock_pdf_reader.assert_called_once()
     
-    @patch('services.pdf_service.PdfReader')
     def test_extract_text_from_multipage_pdf(self, mock_pdf_reader):
         """Test extracting text from a multi-page PDF."""
         # Setup mock with multiple pages
-        mock_page1 = Mock()
-        mock_page1.extract_text.return_value = "Page 1 text"
-        mock_page2 = Mock()
-        mock_page2.extract_text.return_value = "Page 2 text"
+        mock_page1 = NS(extract_text=lambda: "Page 1 text")
+        mock_page2 = NS(extract_text=lambda: "Page 2 text")
         
-        mock_reader_instance = Mock()
-        mock_reader_instance.pages = [mock_page1, mock_page2]
-        mock_pdf_reader.return_value = mock_reader_instance
+        mock_pdf_reader.return_value = NS(pages=[mock_page1, mock_page2])
         
         # Create service and test
         service = PDFService()
@@ -386,6 +1039,249 @@ class TestPDFService:
         
         assert "Page 1 text" in result
         assert "Page 2 text" in result
+    
+    def test_extract_text_from_file_object(self, mock_pdf_reader):
+        """Test that a file object is handed to PdfReader without copying."""
+        mock_page = NS(extract_text=lambda: "Spooled text")
+        mock_pdf_reader.return_value.pages = [mock_page]
+        
+        upload = io.BytesIO(b"fake pdf content")
+        result = PDFService.extract_text_from_pdf(upload)
+        
+        assert result == "Spooled text"
+        mock_pdf_reader.assert_called_once_with(upload)
+    
+    def test_extract_text_skips_pages_without_text(self, mock_pdf_reader):
+        """Test that image-only pages (extract_text returns None) are skipped."""
+        mock_page1 = NS(extract_text=lambda: None)
+        mock_page2 = NS(extract_text=lambda: "Page 2 text")
+        mock_pdf_reader.return_value.pages = [mock_page1, mock_page2]
+        
+        result = PDFService.extract_text_from_pdf(b"fake pdf")
+        
+        assert result == "Page 2 text"
+    
+    def test_process_pdf_reuses_text_for_identical_content(self, mock_pdf_reader, monkeypatch):
+        """Test that re-uploading the same file skips parsing and a different file does not."""
+        # The cache is class-level, so start from an empty one regardless of earlier tests
+        monkeypatch.setattr(PDFService, "_text_cache", OrderedDict())
+        mock_page = NS(extract_text=lambda: "Cached\nresume")
+        mock_pdf_reader.return_value.pages = [mock_page]
+        
+        first = PDFService.process_pdf(io.BytesIO(b"%PDF-1.7 same resume"))
+        second = PDFService.process_pdf(b"%PDF-1.7 same resume")
+        
+        assert first == second == "Cached resume"
+        mock_pdf_reader.assert_called_once()
+        
+        PDFService.process_pdf(b"%PDF-1.7 other resume")
+        
+        assert mock_pdf_reader.call_count == 2
+    
+    def test_sanitize_text_flattens_line_breaks_and_tabs(self):
+        """Test that newlines, carriage returns, tabs, form feeds and NBSPs collapse to single spaces."""
+        assert PDFService.sanitize_text("  Python\r\nDjango\tSQL\n") == "Python Django SQL"
+        assert PDFService.sanitize_text("Page one\x0cPage\xa0two   end") == "Page one Page two end"
+    
+    def test_is_pdf_checks_magic_number_and_rewinds(self):
+        """Test the %PDF- header check for bytes and file objects."""
+        upload = io.BytesIO(b"%PDF-1.7 rest of file")
+        
+        assert PDFService.is_pdf(upload)
+        assert upload.tell() == 0
+        assert PDFService.is_pdf(b"%PDF-1.4")
+        assert not PDFService.is_pdf(b"PK\x03\x04 docx")
+
+
+class TestSemanticCache:
+    """Test embedding-based reuse of interviewer replies."""
+    
+    @staticmethod
+    def fake_encoder(text):
+        """Bag-of-keywords embedding so similarity is predictable."""
+        keywords = ["react", "years", "python", "team"]
+        return [float(word in text.lower()) for word in keywords]
+    
+    def test_similar_answer_hits(self):
+        """Test that an answer above the threshold returns the cached reply."""
+        cache = SemanticCache(threshold=0.9, encoder=self.fake_encoder)
+        cache.store("ns", cache.encode("I've used React for 3 years"), "Nice.", b"audio")
+        
+        hit = cache.lookup("ns", cache.encode("Around three years of React"))
+        
+        assert hit == ("Nice.", b"audio")
+    
+    def test_different_answer_or_namespace_misses(self):
+        """Test that dissimilar answers and other namespaces miss."""
+        cache = SemanticCache(threshold=0.9, encoder=self.fake_encoder)
+        cache.store("ns", cache.encode("I've used React for 3 years"), "Nice.", b"audio")
+        
+        assert cache.lookup("ns", cache.encode("I mostly write Python")) is None
+        assert cache.lookup("other", cache.encode("I've used React for 3 years")) is None
+    
+    def test_save_and_reload(self, tmp_path):
+        """Test that the cache persists to disk."""
+        path = str(tmp_path / "semantic_cache.pkl")
+        cache = SemanticCache(cache_path=path, encoder=self.fake_encoder)
+        cache.store("ns", cache.encode("Python team"), "Tell me more.", None)
+        cache.save()
+        
+        reloaded = SemanticCache(cache_path=path, encoder=self.fake_encoder)
+        
+        assert reloaded.lookup("ns", reloaded.encode("python team")) == ("Tell me more.", None)
+
+    def test_workers_saving_to_one_path_keep_each_others_entries(self, tmp_path):
+        """Test that caches sharing a path merge on save instead of the last writer winning."""
+        path = str(tmp_path / "semantic_cache.pkl")
+        SemanticCache(cache_path=path, encoder=self.fake_encoder).save()
+        first = SemanticCache(cache_path=path, encoder=self.fake_encoder)
+        second = SemanticCache(cache_path=path, encoder=self.fake_encoder)
+        first.store("ns", first.encode("Python team"), "Tell me more.", None)
+        second.store("ns", second.encode("React frontend"), "Which hooks?", None)
+
+        first.save()
+        second.save()
+        second.save()
+        reloaded = SemanticCache(cache_path=path, encoder=self.fake_encoder)
+
+        assert reloaded.lookup("ns", reloaded.encode("python team")) == ("Tell me more.", None)
+        assert reloaded.lookup("ns", reloaded.encode("react frontend")) == ("Which hooks?", None)
+        assert len(reloaded._entries["ns"]) == 2
+        assert sorted(os.listdir(tmp_path)) == ["semantic_cache.pkl", "semantic_cache.pkl.lock"]
+
+    def test_process_interview_turn_uses_cache(self, mock_groq_class):
+        """Test that a cache hit skips Groq entirely."""
+        mock_groq_instance = Mock()
+        mock_groq_class.return_value = mock_groq_instance
+        mock_groq_instance.chat.completions.create = AsyncMock()
+        
+        cache = SemanticCache(encoder=self.fake_encoder)
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test", semantic_cache=cache)
+        kwargs = dict(
+            resume_text="React developer",
+            job_description="Frontend Engineer",
+            candidate_name="Test User",
+            messages=[
+                {"role": "assistant", "content": "How long have you used React?"},
+                {"role": "user", "content": "React for 3 years"},
+            ],
+        )
+        namespace, answer = service._semantic_cache_query(**kwargs)
+        cache.store(namespace, cache.encode(answer), "Great.", b"audio")
+        
+        result = asyncio.run(service.process_interview_turn(**kwargs))
+        
+        assert result == ("Great.", b"audio")
+        mock_groq_instance.chat.completions.create.assert_not_awaited()
+
+    def test_wrap_up_turn_bypasses_cache(self):
+        """Test that closing replies are neither served from nor stored in the semantic cache."""
+        cache = SemanticCache(threshold=0.5, encoder=self.fake_encoder)
+        service = InterviewService(groq_api_key="test", deepgram_api_key="test", semantic_cache=cache)
+        messages = [
+            {"role": role, "content": f"Python team {index}"}
+            for index, role in enumerate(["assistant", "user"] * 8)
+        ]
+
+        async def fake_generate(*args, **kwargs):
+            async def speak():
+                return b"audio"
+            return "Thanks for your time.", [asyncio.create_task(speak())]
+
+        service._generate_with_speech = AsyncMock(side_effect=fake_generate)
+
+        async def run():
+            for _ in range(2):
+                await service.process_interview_turn("", "", "Test User", messages)
+
+        asyncio.run(run())
+
+        assert service._semantic_cache_query("", "", "Test User", messages) is None
+        assert service._generate_with_speech.await_count == 2
+        assert not cache._entries
+
+
+class TestCompletionBatcher:
+    """Test grouping of concurrent Groq completion calls."""
+    
+    def test_concurrent_requests_share_a_batch(self):
+        """Test that requests arriving together are dispatched as one burst."""
+        client = Mock()
+        client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: kwargs["messages"])
+        batcher = CompletionBatcher(client, batch_size=8, batch_timeout=0.05)
+        dispatched = []
+        original_dispatch = batcher._dispatch
+        
+        async def record_dispatch(batch):
+            dispatched.append(len(batch))
+            await original_dispatch(batch)
+        
+        batcher._dispatch = record_dispatch
+        
+        async def run():
+            return await asyncio.gather(*(batcher.submit(messages=i) for i in range(3)))
+        
+        results = asyncio.run(run())
+        
+        assert results == [0, 1, 2]
+        assert dispatched == [3]
+    
+    def test_lone_request_is_not_held_for_the_timeout(self):
+        """Test that a request with nothing queued behind it is dispatched without waiting and not leaked."""
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value="ok")
+        batcher = CompletionBatcher(client, batch_timeout=5)
+        
+        async def run():
+            return await asyncio.wait_for(batcher.submit(messages="solo"), timeout=1)
+        
+        assert asyncio.run(run()) == "ok"
+        assert not batcher._inflight
+    
+    def test_cancelled_stream_is_closed(self):
+        """Test that a stream whose caller was cancelled mid-batch is closed instead of leaked."""
+        stream = Mock(close=AsyncMock())
+        
+        async def create(**kwargs):
+            await asyncio.sleep(0.05)
+            return stream
+        
+        client = Mock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        batcher = CompletionBatcher(client, batch_timeout=0.01)
+        
+        async def run():
+            caller = asyncio.create_task(batcher.submit(messages="hi", stream=True))
+            await asyncio.sleep(0.01)
+            caller.cancel()
+            await asyncio.gather(*batcher._inflight)
+        
+        asyncio.run(run())
+        
+        stream.close.assert_awaited_once()
+    
+    def test_errors_reach_only_their_caller(self):
+        """Test that a failing call does not fail the rest of its batch."""
+        def create(**kwargs):
+            if kwargs["messages"] == "bad":
+                raise RuntimeError("rate limited")
+            return "ok"
+        
+        client = Mock()
+        client.chat.completions.create = AsyncMock(side_effect=create)
+        batcher = CompletionBatcher(client, batch_timeout=0.01)
+        
+        async def run():
+            return await asyncio.gather(
+                batcher.submit(messages="good"),
+                batcher.submit(messages="bad"),
+                return_exceptions=True
+            )
+        
+        good, bad = asyncio.run(run())
+        
+        assert good == "ok"
+        assert isinstance(bad, RuntimeError)
 
 
 if __name__ == "__main__":
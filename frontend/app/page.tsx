@@ -31,6 +31,27 @@ type Step = "setup" | "interview" | "feedback";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
+type ChatEvent =
+  | { type: "sentence"; text: string; audio: string | null }
+  | { type: "done"; response: string }
+  | { type: "error"; detail: string };
+
+/**
+ * Parse one server-sent event from /chat/events (the JSON payload repeats the event type)
+ */
+const parseChatEvent = (rawEvent: string): ChatEvent | null => {
+  const data = rawEvent
+    .split("\n")
+    .filter((line) => line.startsWith("data:"))
+    .map((line) => line.slice(5).trim())
+    .join("\n");
+
+  return data ? (JSON.parse(data) as ChatEvent) : null;
+};
+
+const base64ToBytes = (base64String: string): Uint8Array =>
+  Uint8Array.from(atob(base64String), (char) => char.charCodeAt(0));
+
 export default function Home() {
 
   const [step, setStep] = useState<Step>("setup");
@@ -65,7 +86,7 @@ export default function Home() {
   const {
     isRecording,
     isAudioPlaying,
-    playAudio,
+    playAudioStream,
     stopAudio,
     startRecording,
     stopRecording,
@@ -127,27 +148,76 @@ export default function Home() {
     try {
       chatAbortControllerRef.current = new AbortController();
 
-      const response = await axios.post(`${API_BASE_URL}/chat`, {
-        resume_text: resume,
-        job_description: jobDescription,
-        messages: newHistory,
-        candidate_name: name,
-        difficulty: difficulty,
-      }, {
+      // Server-sent events: one "sentence" event (text + MP3 audio) per sentence, then "done"
+      const response = await fetch(`${API_BASE_URL}/chat/events`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          resume_text: resume,
+          job_description: jobDescription,
+          messages: newHistory,
+          candidate_name: name,
+          difficulty: difficulty,
+        }),
         signal: chatAbortControllerRef.current.signal,
       });
 
-      const botReply = response.data.response;
-      const audioBase64 = response.data.audio;
+      if (!response.ok || !response.body) {
+        throw new Error(`Chat request failed with status ${response.status}`);
+      }
+
+      // Decoded audio segments are piped into a single stream so playback starts with the first sentence
+      const audioPipe = new TransformStream<Uint8Array, Uint8Array>();
+      const audioWriter = audioPipe.writable.getWriter();
+      let audioStarted = false;
+      let spokenText = "";
 
-      setMessages([...newHistory, { role: "assistant", content: botReply }]);
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = "";
 
-      if (audioBase64) {
-        playAudio(audioBase64);
+      try {
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+
+          buffer += value;
+          const rawEvents = buffer.split("\n\n");
+          buffer = rawEvents.pop() ?? "";
+
+          for (const rawEvent of rawEvents) {
+            const event = parseChatEvent(rawEvent);
+            if (!event) continue;
+
+            if (event.type === "error") {
+              throw new Error(event.detail);
+            }
+
+            if (event.type === "done") {
+              setMessages([...newHistory, { role: "assistant", content: event.response }]);
+              continue;
+            }
+
+            spokenText = spokenText ? `${spokenText} ${event.text}` : event.text;
+            setMessages([...newHistory, { role: "assistant", content: spokenText }]);
+
+            if (event.audio) {
+              if (!audioStarted) {
+                audioStarted = true;
+                playAudioStream(audioPipe.readable).catch((error) => {
+                  console.error("Failed to play audio stream:", error);
+                });
+              }
+              // Rejects once playback is interrupted; later segments are simply dropped
+              audioWriter.write(base64ToBytes(event.audio)).catch(() => undefined);
+            }
+          }
+        }
+      } finally {
+        audioWriter.close().catch(() => undefined);
       }
     } 
     catch (error) {
-      if (axios.isCancel(error)) {
+      if (error instanceof DOMException && error.name === "AbortError") {
         console.log("Chat request was cancelled");
         return;
       }
@@ -5,7 +5,7 @@ import { useState, useRef, useEffect, useCallback } from "react";
  * 
  * Features:
  * - Recording audio from microphone
- * - Playing AI-generated audio responses
+ * - Playing AI-generated audio responses (base64 or streamed MP3)
  * - Managing recording/playback state
  * - Proper cleanup on unmount
  */
@@ -135,12 +135,13 @@ export const useInterviewAudio = () => {
   }, []);
 
   /**
-   * Play audio from a base64 encoded string
+   * Start playing audio from any source URL
    * Stops any currently playing audio before playing new audio
    * 
-   * @param base64String - Base64 encoded audio data
+   * @param src - Audio source (data URL or object URL)
+   * @param onFinished - Optional cleanup once this audio element is done
    */
-  const playAudio = useCallback((base64String: string): void => {
+  const startPlayback = useCallback((src: string, onFinished?: () => void): void => {
     try {
       // Stop any currently playing audio
       if (audioPlayerRef.current) {
@@ -149,7 +150,7 @@ export const useInterviewAudio = () => {
       }
 
       // Create new audio element
-      const audio = new Audio(`data:audio/wav;base64,${base64String}`);
+      const audio = new Audio(src);
       audioPlayerRef.current = audio;
 
       // Set up event handlers
@@ -160,12 +161,14 @@ export const useInterviewAudio = () => {
       audio.onended = () => {
         setIsAudioPlaying(false);
         audioPlayerRef.current = null;
+        onFinished?.();
       };
 
       audio.onerror = (error) => {
         console.error("Error playing audio:", error);
         setIsAudioPlaying(false);
         audioPlayerRef.current = null;
+        onFinished?.();
       };
 
       audio.onpause = () => {
@@ -185,6 +188,65 @@ export const useInterviewAudio = () => {
     }
   }, []);
 
+  /**
+   * Play audio from a base64 encoded string
+   * Stops any currently playing audio before playing new audio
+   * 
+   * @param base64String - Base64 encoded MP3 data
+   */
+  const playAudio = useCallback((base64String: string): void => {
+    startPlayback(`data:audio/mpeg;base64,${base64String}`);
+  }, [startPlayback]);
+
+  /**
+   * Play an MP3 stream (e.g. the body of a /chat/stream response) while it downloads
+   * Uses MediaSource so playback starts with the first sentence; falls back to
+   * buffering the whole stream on browsers that can't append MP3 to a SourceBuffer
+   * 
+   * @param stream - Readable stream of MP3 bytes
+   */
+  const playAudioStream = useCallback(async (stream: ReadableStream<Uint8Array>): Promise<void> => {
+    const canStream = typeof MediaSource !== "undefined" && MediaSource.isTypeSupported("audio/mpeg");
+
+    if (!canStream) {
+      const audioBlob = await new Response(stream).blob();
+      const url = URL.createObjectURL(new Blob([audioBlob], { type: "audio/mpeg" }));
+      startPlayback(url, () => URL.revokeObjectURL(url));
+      return;
+    }
+
+    const mediaSource = new MediaSource();
+    const url = URL.createObjectURL(mediaSource);
+
+    mediaSource.addEventListener("sourceopen", async () => {
+      const sourceBuffer = mediaSource.addSourceBuffer("audio/mpeg");
+      const reader = stream.getReader();
+
+      const appendChunk = (chunk: Uint8Array) => new Promise<void>((resolve, reject) => {
+        sourceBuffer.addEventListener("updateend", () => resolve(), { once: true });
+        sourceBuffer.addEventListener("error", () => reject(new Error("Failed to append audio chunk")), { once: true });
+        sourceBuffer.appendBuffer(chunk as BufferSource);
+      });
+
+      try {
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          await appendChunk(value);
+        }
+        if (mediaSource.readyState === "open") {
+          mediaSource.endOfStream();
+        }
+      } catch (error) {
+        // Happens when playback is interrupted (stopAudio) mid-stream
+        console.warn("Audio stream ended early:", error);
+        reader.cancel().catch(() => undefined);
+      }
+    }, { once: true });
+
+    startPlayback(url, () => URL.revokeObjectURL(url));
+  }, [startPlayback]);
+
   /**
    * Stop/interrupt currently playing audio immediately
    * Useful for allowing users to interrupt AI responses
@@ -255,6 +317,7 @@ export const useInterviewAudio = () => {
     startRecording,
     stopRecording,
     playAudio,
+    playAudioStream,
     stopAudio,
     toggleRecording,
   };